@@ -1,9 +1,23 @@
 from django.contrib.auth.models import User
 
 class UserListRepository:
-    def get_by_keyword(self, keyword: str):
-        users: list = (
-            User.objects.filter(username__icontains=keyword).order_by("-date_joined").values("id")
-        )
+    async def a_get_by_keyword(self, keyword: str, skip: int = 0, limit: int = 0):
+        """
+        Returns the IDs of one page of the users matching the keyword and the total
+        number of matches.
 
-        return users
+        Args:
+            keyword (str): The text searched in the usernames.
+            skip (int): The number of users to skip.
+            limit (int): The maximum number of users to return (0 means no limit).
+        """
+        users = User.objects.filter(username__icontains=keyword)
+
+        total: int = await users.acount()
+        page = users.order_by("-date_joined").values_list("id", flat=True)[skip:]
+        if limit:
+            page = page[:limit]
+
+        user_ids: list[int] = [id async for id in page]
+
+        return user_ids, total
@@ -1,7 +1,9 @@
+from django.conf import settings
 from django.contrib.auth.models import User
 
 from apps.accounts.models.user_profile_model import UserProfile
 from apps.accounts.serializers.user_profile_serializers import UserProfileSerializer
+from utils.lru_cache import LRUCache
 
 
 class UserProfileRepository:
@@ -9,8 +11,18 @@ class UserProfileRepository:
     Repository class for user profile-related database operations.
 
     This class encapsulates database interactions related to user profiles.
+
+    Owner data ('get_owner', 'get_owners') is served from an in-process LRU cache with
+    a TTL, entries must be invalidated with 'invalidate_owner' when the user changes.
+    The invalidation only reaches the current process, the other workers see the change
+    once their entry expires ('OWNER_CACHE_TTL', a few seconds).
     """
 
+    owner_cache = LRUCache(
+        maxsize=getattr(settings, "OWNER_CACHE_MAXSIZE", 2048),
+        ttl=getattr(settings, "OWNER_CACHE_TTL", 5),
+    )
+
     def create(self, user: int, name: str, **kwargs):
         instance: UserProfile = UserProfile.objects.create(user=user, name=name, **kwargs)
         return instance
@@ -27,14 +39,117 @@ class UserProfileRepository:
         instance: UserProfile = serializer.save()
         return instance
 
-    def get_owner(self, user_id: int):
-        f = ["username", "userprofile__profile_picture", "userprofile__name"]
-        result: dict = User.objects.filter(id=user_id).values(*f).first()
+    # Fields of the owner data, see 'format_owner'.
+    OWNER_FIELDS: list = ["username", "userprofile__profile_picture", "userprofile__name"]
 
-        data: dict = {
+    def format_owner(self, result: dict):
+        owner: dict = {
             "username": result["username"],
             "profile_picture": result["userprofile__profile_picture"],
             "name": result["userprofile__name"],
         }
 
+        return owner
+
+    def get_cached_owners(self, user_ids: list[int]):
+        """
+        Returns the cached owner data keyed by user ID and the set of user IDs not cached.
+        """
+        data: dict = {}
+        missing: set = set()
+
+        for user_id in set(user_ids):
+            owner: dict | None = self.owner_cache.get(user_id)
+            if owner is None:
+                missing.add(user_id)
+            else:
+                data[user_id] = dict(owner)
+
+        return data, missing
+
+    def get_owner(self, user_id: int):
+        data: dict | None = self.owner_cache.get(user_id)
+        if data is not None:
+            return dict(data)
+
+        result: dict = User.objects.filter(id=user_id).values(*self.OWNER_FIELDS).first()
+        data: dict = self.format_owner(result=result)
+
+        self.owner_cache.set(user_id, data)
+        return dict(data)
+
+    def get_owners(self, user_ids: list[int]):
+        """
+        Retrieves the owner data of several users, querying only the ones not cached.
+
+        Returns a dictionary keyed by user ID. Users that do not exist are not included.
+        """
+        data, missing = self.get_cached_owners(user_ids=user_ids)
+
+        if not missing:
+            return data
+
+        results = User.objects.filter(id__in=missing).values("id", *self.OWNER_FIELDS)
+
+        for result in results:
+            owner: dict = self.format_owner(result=result)
+            self.owner_cache.set(result["id"], owner)
+            data[result["id"]] = dict(owner)
+
         return data
+
+    async def a_get_by_user_id(self, id: int):
+        instance: UserProfile = await UserProfile.objects.aget(user=id)
+        return instance
+
+    async def a_get_by_username(self, username: str):
+        instance: UserProfile = await UserProfile.objects.aget(user__username=username)
+        return instance
+
+    async def a_get_owner(self, user_id: int):
+        """
+        Async version of 'get_owner', returns None if the user does not exist.
+
+        Cache hits are served without leaving the event loop.
+        """
+        data: dict | None = self.owner_cache.get(user_id)
+        if data is not None:
+            return dict(data)
+
+        result: dict | None = (
+            await User.objects.filter(id=user_id).values(*self.OWNER_FIELDS).afirst()
+        )
+        if result is None:
+            return None
+
+        data: dict = self.format_owner(result=result)
+
+        self.owner_cache.set(user_id, data)
+        return dict(data)
+
+    async def a_get_owners(self, user_ids: list[int]):
+        """
+        Async version of 'get_owners'.
+
+        Cache hits are served without leaving the event loop, the missing users are
+        fetched with one query.
+        """
+        data, missing = self.get_cached_owners(user_ids=user_ids)
+
+        if not missing:
+            return data
+
+        results = User.objects.filter(id__in=missing).values("id", *self.OWNER_FIELDS)
+
+        async for result in results:
+            owner: dict = self.format_owner(result=result)
+            self.owner_cache.set(result["id"], owner)
+            data[result["id"]] = dict(owner)
+
+        return data
+
+    def invalidate_owner(self, user_id: int):
+        """
+        Removes the cached owner data of a user.
+        """
+        self.owner_cache.delete(user_id)
@@ -25,6 +25,18 @@ class UserRepository:
         exists: bool = User.objects.filter(email=email).exists()
         return exists
 
+    async def a_get_by_id(self, id: int):
+        instance: User = await User.objects.aget(id=id)
+        return instance
+
+    async def a_get_by_username(self, username: str):
+        instance: User = await User.objects.aget(username=username)
+        return instance
+
+    async def a_username_exists(self, username: str):
+        exists: bool = await User.objects.filter(username=username).aexists()
+        return exists
+
     def check_password(self, instance: User, password: str):
         is_valid: bool = instance.check_password(password)
         return is_valid
@@ -1,51 +1,49 @@
-from bson import BSON
-
 from apps.accounts.repositories.user_list_repository import UserListRepository
 from apps.accounts.repositories.user_profile_repository import UserProfileRepository
-from apps.polls.repositories.user_actions_repository import UserActionsRepository
-from utils.utils import Utils
+from apps.polls.repositories.active_users_repository import ActiveUsersRepository
 from utils.pagination import Pagination
 
 
 class UserListService:
     repository = UserListRepository()
     user_profile_repository = UserProfileRepository()
-    user_actions_repository = UserActionsRepository()
-    utils = Utils()
+    active_users_repository = ActiveUsersRepository()
     pagination = Pagination()
 
-    def get_by_keyword(self, keyword: str, page: int, page_size: int):
-        user_id_list: list[dict] = self.repository.get_by_keyword(keyword=keyword)
+    async def a_get_by_keyword(self, keyword: str, page: int, page_size: int):
+        skip, limit = self.pagination.get_skip_limit(page=page, page_size=page_size)
 
-        data: dict = self.pagination.paginate(
-            object_list=user_id_list, page=page, page_size=page_size
+        user_id_list, total_items = await self.repository.a_get_by_keyword(
+            keyword=keyword, skip=skip, limit=limit
         )
 
+        owners: dict = await self.user_profile_repository.a_get_owners(user_ids=user_id_list)
+
         items: list[dict] = []
-        for user in data["items"]:
+        for id in user_id_list:
             item: dict = {}
-            item["user"] = self.user_profile_repository.get_owner(user_id=user["id"])
+            item["user"] = owners.get(id)
             items.append(item)
 
-        data["items"] = items
-
-        return data
+        return self.pagination.paginate_page(
+            items=items, total_items=total_items, page=page, page_size=page_size
+        )
 
-    async def get_user_list_by_actions(self, page: int, page_size: int, user_id: int | None = None):
-        user_id_list: list[BSON] = await self.user_actions_repository.get_user_id_list()
-        user_id_list = [user for user in user_id_list if user["_id"] != user_id]
-        user_id_list: list[dict] = await self.utils.bson_to_json(bson=user_id_list)
+    async def explore_user_list(self, page: int, page_size: int, user_id: int | None = None):
+        skip, limit = self.pagination.get_skip_limit(page=page, page_size=page_size)
 
-        data: dict = await self.pagination.paginate(
-            object_list=user_id_list, page=page, page_size=page_size
+        user_id_list, total_items = await self.active_users_repository.get_page(
+            skip=skip, limit=limit, exclude_user_id=user_id
         )
 
+        owners: dict = await self.user_profile_repository.a_get_owners(user_ids=user_id_list)
+
         items: list[dict] = []
-        for user in data.items:
+        for id in user_id_list:
             item: dict = {}
-            item["user"] = await self.utils.get_owner(user_id=user["_id"])
+            item["user"] = owners.get(id)
             items.append(item)
 
-        data.items = items
-
-        return data
+        return self.pagination.paginate_page(
+            items=items, total_items=total_items, page=page, page_size=page_size
+        )
@@ -72,6 +72,7 @@ class UserProfileService:
             return None
 
         instance: UserProfile = self.repository.update(serializer=serializer)
+        self.repository.invalidate_owner(user_id=instance.user_id)
 
         return instance
 
@@ -89,4 +90,43 @@ class UserProfileService:
 
         data: dict = self.repository.get_owner(user_id=user_id)
 
-        return data
\ No newline at end of file
+        return data
+
+    def get_owners(self, user_ids: list[int]):
+        """
+        Retrieves and formats information about several owners at once.
+
+        Args:
+            user_ids (list[int]): The IDs of the users (owners) to retrieve, duplicates are allowed.
+
+        Returns:
+            dict: A dictionary mapping each existing user ID to its formatted owner data.
+        """
+
+        data: dict = self.repository.get_owners(user_ids=user_ids)
+
+        return data
+
+    async def a_get_by_user_id(self, id: int, raise_exception: bool = True):
+        """
+        Async version of 'get_by_user_id'.
+        """
+        try:
+            instance: UserProfile = await self.repository.a_get_by_user_id(id=id)
+
+        except UserProfile.DoesNotExist:
+            if raise_exception:
+                message: str = f"User profile with ID {id} does not exist."
+                raise NotFound(detail=message)
+
+            return None
+
+        return instance
+
+    async def a_get_owner(self, user_id: int):
+        data: dict | None = await self.repository.a_get_owner(user_id=user_id)
+        return data
+
+    async def a_get_owners(self, user_ids: list[int]):
+        data: dict = await self.repository.a_get_owners(user_ids=user_ids)
+        return data
@@ -9,6 +9,7 @@ from apps.accounts.serializers.user_serialziers import (
 )
 
 from apps.accounts.repositories.user_repository import UserRepository
+from apps.accounts.repositories.user_profile_repository import UserProfileRepository
 
 
 class UserService:
@@ -18,6 +19,7 @@ class UserService:
     This class encapsulates business logic related to user management.
     """
     repository = UserRepository()
+    user_profile_repository = UserProfileRepository()
 
     def create_user(self, data: dict, raise_exception: bool = True):
         """
@@ -99,7 +101,8 @@ class UserService:
             return None
 
         instance: User = self.repository.update_username(instance=instance, username=new_username)
-        
+        self.user_profile_repository.invalidate_owner(user_id=instance.id)
+
         return instance
 
     def update_password(self, instance: User, data: dict, raise_exception: bool = True):
@@ -1,3 +1,86 @@
-from django.test import TestCase
+from unittest.mock import patch
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from utils.lru_cache import LRUCache
+
+
+class LRUCacheTests(SimpleTestCase):
+    def test_get_returns_the_value_set(self):
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set("a", {"name": "A"})
+
+        self.assertEqual(cache.get("a"), {"name": "A"})
+
+    def test_missing_key_returns_default(self):
+        cache = LRUCache(maxsize=2, ttl=60)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("a", default="x"), "x")
+
+    def test_entries_expire_after_ttl(self):
+        cache = LRUCache(maxsize=2, ttl=10)
+
+        with patch("utils.lru_cache.monotonic", return_value=100.0):
+            cache.set("a", 1)
+
+        with patch("utils.lru_cache.monotonic", return_value=109.0):
+            self.assertEqual(cache.get("a"), 1)
+
+        with patch("utils.lru_cache.monotonic", return_value=111.0):
+            self.assertIsNone(cache.get("a"))
+
+        # The expired entry is removed.
+        self.assertEqual(cache.stats()["size"], 0)
+
+    def test_least_recently_used_is_evicted(self):
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        # "a" becomes the most recently used, "b" is evicted.
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_set_existing_key_refreshes_it(self):
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("a", 10)
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 10)
+        self.assertIsNone(cache.get("b"))
+
+    def test_hit_and_miss_counters(self):
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+
+        cache.get("a")
+        cache.get("a")
+        cache.get("b")
+
+        stats: dict = cache.stats()
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["size"], 1)
+
+    def test_delete(self):
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.delete("a")
+        cache.delete("missing")
+
+        self.assertIsNone(cache.get("a"))
+
+    def test_clear_resets_entries_and_counters(self):
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.clear()
+
+        self.assertEqual(cache.stats(), {"size": 0, "maxsize": 2, "ttl": 60, "hits": 0, "misses": 0})
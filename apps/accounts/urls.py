@@ -18,6 +18,7 @@ from .views.user_profile_public_views import (
     UserProfileGetByUserIdAPIView,
 )
 from .views.user_search_view import UserSearchAPIView
+from .views.explore_users_view import ExploreUsersAPIView
 
 
 urlpatterns = [
@@ -83,4 +84,9 @@ urlpatterns = [
         view=UserSearchAPIView.as_view(),
         name="user_search",
     ),
+    path(
+        route="explore",
+        view=ExploreUsersAPIView.as_view(),
+        name="explore_users",
+    ),
 ]
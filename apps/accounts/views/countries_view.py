@@ -1,22 +1,17 @@
-from datetime import datetime, timedelta
+from datetime import timedelta
 
-from rest_framework import status
-from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
 
 from apps.accounts.utils.countries import COUNTRIES
+from utils.static_payload import StaticPayload
 
 
 class GetCountriesAPIView(APIView):
     permission_classes = [AllowAny]
 
-    def get(self, request):
-        TTL = timedelta(weeks=1)
-        expiration_date = datetime.utcnow() + TTL
-
-        response = Response(data=COUNTRIES, status=status.HTTP_200_OK)
-        response["Cache-Control"] = f"max-age={int(TTL.total_seconds())}"
-        response["Expires"] = expiration_date.strftime("%a, %d %b %Y %H:%M:%S GMT")
+    # Rendered and compressed once, at import.
+    payload = StaticPayload(data=COUNTRIES, max_age=int(timedelta(weeks=1).total_seconds()))
 
-        return response
+    def get(self, request):
+        return self.payload.response(request=request)
@@ -11,8 +11,8 @@ class ExploreUsersAPIView(APIView):
     service = UserListService()
 
     async def get(self, request):
-        page: int = int(request.GET.get("page")) or 1
-        page_size: int = int(request.GET.get("page_size")) or 4
+        page: int = int(request.GET.get("page", "1"))
+        page_size: int = int(request.GET.get("page_size", "4"))
 
         data: dict = await self.service.explore_user_list(
             user_id=request.user.id, page=page, page_size=page_size
@@ -12,7 +12,7 @@ class UserSearchAPIView(APIView):
 
     service = UserListService()
 
-    def get(self, request):
+    async def get(self, request):
         keyword: str = request.GET.get("query")
         page: int = int(request.GET.get("page", "1"))
         page_size: int = int(request.GET.get("page_size", "4"))
@@ -24,6 +24,8 @@ class UserSearchAPIView(APIView):
         except ValidationError as error:
             return Response(data=error.detail, status=status.HTTP_400_BAD_REQUEST)
 
-        data: dict = self.service.get_by_keyword(keyword=keyword, page=page, page_size=page_size)
+        data: dict = await self.service.a_get_by_keyword(
+            keyword=keyword, page=page, page_size=page_size
+        )
 
         return Response(data=data, status=status.HTTP_200_OK)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class PollsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.polls'
+
+    def ready(self):
+        # Registers the project checks ('manage.py check').
+        import config.checks  # noqa: F401
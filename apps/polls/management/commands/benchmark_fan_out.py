@@ -0,0 +1,124 @@
+import asyncio
+import statistics
+import time
+
+from bson import BSON
+
+from django.core.management.base import BaseCommand
+
+from apps.polls.services.poll_comment_list_service import PollCommentListService
+from apps.polls.services.poll_service import PollService
+
+
+class Command(BaseCommand):
+    """
+    Compares the latency of the read paths that fan out their independent lookups
+    ('run_concurrently') with the same lookups awaited in sequence.
+
+    - poll detail: 'PollService.get_by_id', the live versions of the poll, the user
+      actions of the viewer and the cached poll. The poll cache is cleared before each
+      call, so the poll is read from the database.
+    - comment list: 'PollCommentListService.get_by_poll_id', the poll and its comments.
+
+    Runs read-only against the application database, the poll must be visible to the
+    user. Both variants alternate on each iteration so that they see the same database
+    and cache state.
+
+    Example:
+        python manage.py benchmark_fan_out --poll-id 65a1... --user-id 1 --iterations 500
+    """
+
+    help = "Compares the latency of concurrent and sequential lookups of the poll read paths."
+
+    poll_service = PollService()
+    poll_comment_list_service = PollCommentListService()
+
+    def add_arguments(self, parser):
+        parser.add_argument("--poll-id", required=True)
+        parser.add_argument("--user-id", type=int, default=None)
+        parser.add_argument("--iterations", type=int, default=200)
+
+    def handle(self, *args, **options):
+        results: dict = asyncio.run(self.run(**options))
+
+        for path, latencies in results.items():
+            sequential: float = statistics.mean(latencies["sequential"])
+            concurrent: float = statistics.mean(latencies["concurrent"])
+
+            self.stdout.write(
+                f"{path}: sequential {sequential * 1000:.3f} ms, "
+                f"concurrent {concurrent * 1000:.3f} ms ({sequential / concurrent:.2f}x)"
+            )
+
+    async def run(self, poll_id: str, user_id: int | None, iterations: int, **kwargs):
+        cases: dict = {
+            "poll detail": {
+                "sequential": lambda: self.sequential_poll_detail(id=poll_id, user_id=user_id),
+                "concurrent": lambda: self.poll_service.get_by_id(id=poll_id, user_id=user_id),
+            },
+            "comment list": {
+                "sequential": lambda: self.sequential_comment_list(
+                    poll_id=poll_id, user_id=user_id
+                ),
+                "concurrent": lambda: self.poll_comment_list_service.get_by_poll_id(
+                    poll_id=poll_id, page=1, page_size=10, user_id=user_id
+                ),
+            },
+        }
+
+        results: dict = {path: {name: [] for name in variants} for path, variants in cases.items()}
+
+        for _ in range(iterations):
+            for path, variants in cases.items():
+                for name, call in variants.items():
+                    await self.poll_service.cache.invalidate(id=poll_id)
+
+                    started: float = time.perf_counter()
+                    await call()
+                    results[path][name].append(time.perf_counter() - started)
+
+        return results
+
+    async def sequential_poll_detail(self, id: str, user_id: int | None):
+        """
+        'PollService.get_by_id' with the lookups of 'get_state' awaited one after the other.
+        """
+        service: PollService = self.poll_service
+
+        await service.utils.validate_id(id=id)
+        version: dict = await service.repository.get_version(id=id)
+        user_actions: dict | None = await service.get_user_actions(id=id, user_id=user_id)
+        poll: dict | None = await service.cache.get(id=id)
+        await service.utils.check_poll_privacy(user_id=user_id, poll=version)
+        owner: dict | None = await service.user_profile_service.a_get_owner(
+            user_id=version["user_id"]
+        )
+
+        state: dict = {
+            "version": version,
+            "user_actions": user_actions,
+            "owner": owner,
+            "poll": poll,
+        }
+        return await service.get_by_id(id=id, user_id=user_id, state=state)
+
+    async def sequential_comment_list(self, poll_id: str, user_id: int | None):
+        """
+        'PollCommentListService.get_by_poll_id' with its lookups awaited one after the other.
+        """
+        service: PollCommentListService = self.poll_comment_list_service
+
+        await service.utils.validate_id(id=poll_id)
+        poll: BSON = await service.poll_repository.get_version(id=poll_id)
+        await service.utils.check_poll_privacy(poll=poll, user_id=user_id)
+        comments: list[BSON] = await service.repository.get_by_poll_id(id=poll_id)
+        owners: dict = await service.user_profile_service.a_get_owners(
+            user_ids=[comment["user_id"] for comment in comments]
+        )
+
+        data: dict = service.pagination.paginate(object_list=comments, page=1, page_size=10)
+        data["items"] = await service.filter_poll_comment_list(
+            comments=data["items"], owners=owners
+        )
+
+        return data, service.make_etag(poll_id=poll_id, poll=poll, owners=owners)
@@ -0,0 +1,137 @@
+import asyncio
+import random
+import timeit
+from datetime import datetime, timedelta
+
+import bson
+from bson.objectid import ObjectId
+from bson.raw_bson import RawBSONDocument
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.polls.utils.json_converter import poll_comment_to_json, poll_to_json
+from apps.polls.utils.poll_comment_utils import PollCommentUtils
+
+
+class Command(BaseCommand):
+    """
+    Benchmarks the single pass converters of 'json_converter' against the two step path
+    ('bson_to_json' then 'simplify_poll_data' / 'simplify_poll_comment_data').
+
+    With '--raw', also compares decoding the polls from BSON bytes as dicts and as
+    'RawBSONDocument' (the 'POLL_LIST_RAW_BSON' setting), before the conversion.
+
+    Runs on generated documents, no database is needed. The outputs of both paths are
+    compared first, the command fails if they differ.
+
+    Example:
+        python manage.py benchmark_json_converter --documents 1000 --repeat 5 --raw
+    """
+
+    help = "Compares the speed of the single pass BSON to JSON converters with json_util."
+
+    utils = PollCommentUtils()
+
+    def add_arguments(self, parser):
+        parser.add_argument("--documents", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--raw", action="store_true", help="Also benchmark RawBSONDocument.")
+
+    def handle(self, *args, **options):
+        random.seed(options["seed"])
+
+        polls: list = [self.make_poll() for _ in range(options["documents"])]
+        comments: list = [self.make_comment() for _ in range(options["documents"])]
+
+        cases: list = [
+            ("polls", polls, self.two_step_polls, self.single_pass_polls),
+            ("comments", comments, self.two_step_comments, self.single_pass_comments),
+        ]
+
+        if options["raw"]:
+            encoded: list = [bson.encode(poll) for poll in polls]
+            cases.append(("polls from bytes", encoded, self.decoded_polls, self.raw_polls))
+
+        for name, documents, two_step, single_pass in cases:
+            if two_step(documents) != single_pass(documents):
+                raise CommandError(f"The converters produce different {name}.")
+
+            old: float = min(
+                timeit.repeat(lambda: two_step(documents), number=1, repeat=options["repeat"])
+            )
+            new: float = min(
+                timeit.repeat(lambda: single_pass(documents), number=1, repeat=options["repeat"])
+            )
+
+            self.stdout.write(
+                f"{name}: {len(documents)} documents, {two_step.__name__} {old * 1000:.2f} ms, "
+                f"{single_pass.__name__} {new * 1000:.2f} ms ({old / new:.1f}x)"
+            )
+
+    def two_step_polls(self, polls: list):
+        async def convert():
+            data: list = await self.utils.bson_to_json(bson=polls)
+            return [await self.utils.simplify_poll_data(poll=poll) for poll in data]
+
+        return asyncio.run(convert())
+
+    def single_pass_polls(self, polls: list):
+        return [poll_to_json(poll=poll) for poll in polls]
+
+    def two_step_comments(self, comments: list):
+        async def convert():
+            data: list = await self.utils.bson_to_json(bson=comments)
+            return [await self.utils.simplify_poll_comment_data(comment=c) for c in data]
+
+        return asyncio.run(convert())
+
+    def single_pass_comments(self, comments: list):
+        return [poll_comment_to_json(comment=comment) for comment in comments]
+
+    def decoded_polls(self, encoded: list):
+        return [poll_to_json(poll=bson.decode(poll)) for poll in encoded]
+
+    def raw_polls(self, encoded: list):
+        return [poll_to_json(poll=RawBSONDocument(poll)) for poll in encoded]
+
+    def make_date(self):
+        return datetime(2024, 1, 1) + timedelta(
+            seconds=random.randint(0, 10**7), microseconds=random.choice([0, 123000, 999999])
+        )
+
+    def make_poll(self):
+        options: list = [
+            {"user_id": random.randint(1, 100), "option_text": f"Option {o}", "votes": o}
+            for o in range(random.randint(2, 6))
+        ]
+
+        return {
+            "_id": ObjectId(),
+            "title": "Poll title",
+            "description": "Poll description",
+            "privacy": random.choice(["public", "private"]),
+            "category": "technology",
+            "user_id": random.randint(1, 100),
+            "created_at": self.make_date(),
+            "options": options,
+            "votes_counter": sum(o["votes"] for o in options),
+            "shares_counter": 0,
+            "bookmarks_counter": 0,
+            "comments_counter": 0,
+            "version": 1,
+            "comments_version": 1,
+            "authenticated_user_actions": [
+                {"has_voted": {"vote": "Option 0", "voted_at": self.make_date()}}
+            ],
+        }
+
+    def make_comment(self):
+        return {
+            "_id": ObjectId(),
+            "user_id": random.randint(1, 100),
+            "comment": "Comment text",
+            "created_at": self.make_date(),
+            "poll_id": ObjectId(),
+            "version": 1,
+        }
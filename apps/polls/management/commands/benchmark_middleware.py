@@ -0,0 +1,117 @@
+import asyncio
+import statistics
+import time
+
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncRequestFactory, override_settings
+from django.urls import reverse
+
+from config.checks import check_async_middleware, get_thread_hooks
+from config.middleware.mongo_middleware import MongoDBMiddleware
+
+
+class SyncOnlyMongoDBMiddleware(MongoDBMiddleware):
+    """
+    'MongoDBMiddleware' as it was before it became async capable, Django adapts the
+    handler chain around it.
+    """
+
+    async_capable = False
+
+
+class Command(BaseCommand):
+    """
+    Compares the per-request latency of 'PollAPIView.get' through the middleware stack
+    of 'MIDDLEWARE' ("async") and through the same stack with a sync-only
+    'MongoDBMiddleware' ("sync", the stack before it became async capable).
+
+    The requests are anonymous GETs of an existing public poll, run through Django's
+    async request handler (no server). After the first request the poll is served from
+    the poll cache, so the difference is mostly the cost of the thread hops. The
+    'check_async_middleware' warnings of each stack are printed first.
+
+    With the sync-only middleware last, Django runs the whole stack sync in one thread
+    (one adaptation per request), with an async stack each hook of the 'MiddlewareMixin'
+    middleware runs in a thread ('get_thread_hooks').
+
+    Example:
+        python manage.py benchmark_middleware --poll-id 65a1... --requests 2000 --concurrency 10
+    """
+
+    help = "Compares the latency of PollAPIView.get with an async and a sync-only middleware."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--poll-id", required=True, help="The ID of a public poll.")
+        parser.add_argument("--requests", type=int, default=1000)
+        parser.add_argument("--concurrency", type=int, default=1)
+        parser.add_argument("--rounds", type=int, default=3)
+
+    def handle(self, *args, **options):
+        mongo_middleware: str = "config.middleware.mongo_middleware.MongoDBMiddleware"
+        if mongo_middleware not in settings.MIDDLEWARE:
+            raise CommandError(f"'{mongo_middleware}' is not in MIDDLEWARE.")
+
+        sync_only: str = f"{__name__}.SyncOnlyMongoDBMiddleware"
+        stacks: dict = {
+            "async": list(settings.MIDDLEWARE),
+            "sync": [
+                sync_only if middleware == mongo_middleware else middleware
+                for middleware in settings.MIDDLEWARE
+            ],
+        }
+
+        latencies: dict = {name: [] for name in stacks}
+
+        for name, middleware in stacks.items():
+            with override_settings(MIDDLEWARE=middleware):
+                for warning in check_async_middleware():
+                    self.stdout.write(f"{name}: {warning.msg}")
+
+                # Behind a sync-only middleware, the stack runs sync in a single thread.
+                if name == "async":
+                    self.stdout.write(f"{name}: {len(get_thread_hooks())} hooks run in a thread")
+
+        # The stacks alternate so that both see the same database and cache state.
+        for _ in range(options["rounds"]):
+            for name, middleware in stacks.items():
+                with override_settings(MIDDLEWARE=middleware):
+                    latencies[name] += asyncio.run(self.run(**options))
+
+        for name, values in latencies.items():
+            values.sort()
+            self.stdout.write(
+                f"{name}: {len(values)} requests, "
+                f"mean {statistics.mean(values) * 1000:.3f} ms, "
+                f"p50 {values[len(values) // 2] * 1000:.3f} ms, "
+                f"p99 {values[int(len(values) * 0.99)] * 1000:.3f} ms"
+            )
+
+    async def run(self, poll_id: str, requests: int, concurrency: int, **kwargs) -> list:
+        handler = BaseHandler()
+        handler.load_middleware(is_async=True)
+        factory = AsyncRequestFactory()
+        path: str = reverse("poll", kwargs={"id": poll_id})
+
+        response = await handler.get_response_async(factory.get(path))
+        if response.status_code != 200:
+            raise CommandError(f"GET of the poll returned {response.status_code}.")
+
+        latencies: list = []
+
+        async def worker(count: int):
+            for _ in range(count):
+                request = factory.get(path)
+                started: float = time.perf_counter()
+                await handler.get_response_async(request)
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(
+            *(
+                worker(requests // concurrency + (index < requests % concurrency))
+                for index in range(concurrency)
+            )
+        )
+
+        return latencies
@@ -0,0 +1,340 @@
+import asyncio
+import os
+import random
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
+from apps.polls.repositories.active_users_repository import ActiveUsersRepository
+from apps.polls.repositories.indexes import INDEX_REGISTRY
+from apps.polls.repositories.poll_comment_list_repository import PollCommentListRepository
+from apps.polls.repositories.poll_list_repository import PollListRepository
+from apps.polls.repositories.user_actions_repository import UserActionsRepository
+
+
+class QueryRecorder(monitoring.CommandListener):
+    """
+    Keeps the read commands sent by the client, labeled with the current query shape.
+    """
+
+    commands: tuple = ("find", "aggregate", "count", "distinct")
+
+    def __init__(self):
+        self.label: str = ""
+        self.queries: list = []
+
+    def started(self, event):
+        # Only the queries issued inside a labeled shape are kept.
+        if event.command_name not in self.commands or not self.label:
+            return
+
+        # Drop the session and cluster fields, they are not valid inside 'explain'.
+        command: dict = {
+            key: value
+            for key, value in event.command.items()
+            if not key.startswith("$") and key not in ("lsid", "txnNumber")
+        }
+        self.queries.append((self.label, command))
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+class Command(BaseCommand):
+    """
+    Query plan regression check.
+
+    Seeds a scratch database, builds the declared indexes ('INDEX_REGISTRY') and runs
+    every query shape issued by 'PollListRepository', 'PollCommentListRepository',
+    'UserActionsRepository' and 'ActiveUsersRepository'. The commands sent to the server
+    are recorded and run again with 'explain' ("executionStats" verbosity). A query fails
+    when its plan has a 'COLLSCAN' stage (or a '$lookup' that scans a collection), or
+    when it examines more than '--max-ratio' documents per returned document. The shapes
+    of 'excluded' scan by design, they are listed with their reason and not explained.
+    Needs a running mongod ('MONGO_URI').
+
+    Example:
+        python manage.py check_query_plans
+        python manage.py check_query_plans --polls 20000 --max-ratio 5 --keep
+    """
+
+    help = "Fails when a repository query does a collection scan or examines too many documents."
+
+    categories: list = ["technology", "science", "sports", "music", "travel"]
+
+    # Query shapes that scan a collection by design, with the reason.
+    excluded: dict = {
+        "active users refresh": "rebuilds the ranking from all of 'user_actions', it runs "
+        "periodically ('refresh_active_users'), not per request",
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--polls", type=int, default=5000)
+        parser.add_argument("--actions", type=int, default=20000)
+        parser.add_argument("--comments", type=int, default=10000)
+        parser.add_argument("--max-ratio", type=float, default=10.0)
+        parser.add_argument("--database", default="polls_query_plans")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--keep", action="store_true", help="Don't drop the database.")
+
+    def handle(self, *args, **options):
+        if options["database"] == "polls_db":
+            raise CommandError("The check database can't be the application database.")
+
+        random.seed(options["seed"])
+        asyncio.run(self.run(**options))
+
+    async def run(self, database: str, max_ratio: float, **options):
+        recorder = QueryRecorder()
+        client = AsyncIOMotorClient(os.getenv("MONGO_URI"), event_listeners=[recorder])
+        polls_db = client[database]
+
+        await client.drop_database(database)
+
+        try:
+            await self.seed(polls_db=polls_db, **options)
+
+            for collection, indexes in INDEX_REGISTRY.items():
+                await polls_db[collection].create_indexes(indexes)
+
+            await self.run_queries(polls_db=polls_db, recorder=recorder)
+
+            failures: list = []
+            for label, command in recorder.queries:
+                if label in self.excluded:
+                    self.stdout.write(f"{label}: excluded, {self.excluded[label]}")
+                    continue
+
+                explain: dict = await polls_db.command(
+                    {"explain": command, "verbosity": "executionStats"}
+                )
+                failures += self.check_plan(label=label, explain=explain, max_ratio=max_ratio)
+
+        finally:
+            if not options.get("keep"):
+                await client.drop_database(database)
+            client.close()
+
+        if failures:
+            for failure in failures:
+                self.stderr.write(failure)
+            raise CommandError(f"{len(failures)} query plan checks failed.")
+
+        checked: int = sum(label not in self.excluded for label, _ in recorder.queries)
+        self.stdout.write(self.style.SUCCESS(f"{checked} queries checked."))
+
+    async def seed(self, polls_db, users: int, polls: int, actions: int, comments: int, **kwargs):
+        now: datetime = datetime.now()
+
+        poll_documents: list = []
+        for index in range(polls):
+            options: list = [
+                {"user_id": 0, "option_text": f"Option {o}", "votes": random.randint(0, 50)}
+                for o in range(3)
+            ]
+            poll_documents.append(
+                {
+                    "title": f"Poll {index} {random.choice(self.categories)}",
+                    "description": f"Description of poll {index}",
+                    "privacy": "private" if random.random() < 0.1 else "public",
+                    "category": random.choice(self.categories),
+                    "user_id": random.randint(1, users),
+                    "created_at": now - timedelta(minutes=index),
+                    "options": options,
+                    "votes_counter": sum(o["votes"] for o in options),
+                    "shares_counter": 0,
+                    "bookmarks_counter": 0,
+                    "comments_counter": 0,
+                }
+            )
+        poll_ids: list = (await polls_db.polls.insert_many(poll_documents)).inserted_ids
+
+        pairs: set = set()
+        while len(pairs) < min(actions, users * polls):
+            pairs.add((random.randint(1, users), random.choice(poll_ids)))
+
+        action_documents: list = []
+        for user_id, poll_id in pairs:
+            document: dict = {"user_id": user_id, "poll_id": poll_id}
+            date: datetime = now - timedelta(seconds=random.randint(0, 10**6))
+            if random.random() < 0.8:
+                document["has_voted"] = {"vote": "Option 0", "voted_at": date}
+            if random.random() < 0.2:
+                document["has_shared"] = {"shared_at": date}
+            if random.random() < 0.2:
+                document["has_bookmarked"] = {"bookmarked_at": date}
+            action_documents.append(document)
+        if action_documents:
+            await polls_db.user_actions.insert_many(action_documents)
+
+        comment_documents: list = [
+            {
+                "user_id": random.randint(1, users),
+                "comment": f"Comment {index}",
+                "created_at": now - timedelta(seconds=index),
+                "poll_id": random.choice(poll_ids),
+            }
+            for index in range(comments)
+        ]
+        if comment_documents:
+            await polls_db.comments.insert_many(comment_documents)
+
+    async def run_queries(self, polls_db, recorder: QueryRecorder):
+        poll_list_repository = PollListRepository()
+        poll_list_repository.polls_db = polls_db
+        comment_list_repository = PollCommentListRepository()
+        comment_list_repository.polls_db = polls_db
+        user_actions_repository = UserActionsRepository()
+        user_actions_repository.polls_db = polls_db
+        active_users_repository = ActiveUsersRepository()
+        active_users_repository.polls_db = polls_db
+
+        poll: dict = await polls_db.polls.find_one({"privacy": "public"})
+        poll_id: str = str(poll["_id"])
+        user_id: int = poll["user_id"]
+        category: str = poll["category"]
+
+        async def record(label: str, query):
+            recorder.label = label
+            result = await query
+            recorder.label = ""
+            return result
+
+        for viewer in (user_id, None):
+            joined: bool = viewer is not None
+            suffix: str = " (with user actions)" if joined else " (anonymous)"
+            kwargs: dict = {"user_id": viewer, "limit": 10, "with_user_actions": joined}
+
+            await record(
+                "polls by keyword" + suffix,
+                poll_list_repository.get_by_keyword(keyword="technology", **kwargs),
+            )
+            await record(
+                "polls by user" + suffix,
+                poll_list_repository.get_by_user_id(id=user_id, skip=10, **kwargs),
+            )
+            await record(
+                "polls by category" + suffix,
+                poll_list_repository.get_by_category(category=category, skip=10, **kwargs),
+            )
+            for feed in ("votes", "shares", "bookmarks"):
+                method = getattr(poll_list_repository, f"get_by_user_{feed}")
+                await record(f"polls by user {feed}" + suffix, method(id=user_id, **kwargs))
+
+            sort: list = PollListRepository.RECENT_SORT
+            polls: list = await record(
+                "polls by category, first page" + suffix,
+                poll_list_repository.get_by_category_after(category=category, **kwargs),
+            )
+            after: list = [polls[-1][field] for field, _ in sort]
+            await record(
+                "polls by category, next page" + suffix,
+                poll_list_repository.get_by_category_after(
+                    category=category, after=after, **kwargs
+                ),
+            )
+
+            polls: list = await record(
+                "polls by user, first page" + suffix,
+                poll_list_repository.get_by_user_id_after(id=user_id, **kwargs),
+            )
+            after: list = [polls[-1][field] for field, _ in sort]
+            await record(
+                "polls by user, next page" + suffix,
+                poll_list_repository.get_by_user_id_after(id=user_id, after=after, **kwargs),
+            )
+
+            polls: list = await record(
+                "polls by keyword, first page" + suffix,
+                poll_list_repository.get_by_keyword_after(keyword="technology", **kwargs),
+            )
+            popular: list = PollListRepository.POPULAR_SORT
+            after: list = [polls[-1][field] for field, _ in popular]
+            await record(
+                "polls by keyword, next page" + suffix,
+                poll_list_repository.get_by_keyword_after(
+                    keyword="technology", after=after, **kwargs
+                ),
+            )
+
+        await record("comments by poll", comment_list_repository.get_by_poll_id(id=poll_id))
+        await record("comment authors of a poll", comment_list_repository.get_user_ids(id=poll_id))
+
+        await record(
+            "user actions of a poll",
+            user_actions_repository.get_user_actions(id=poll_id, user_id=user_id),
+        )
+        poll_ids: list = [p["_id"] async for p in polls_db.polls.find({}, limit=20)]
+        await record(
+            "user actions of a page of polls",
+            user_actions_repository.get_user_actions_for_polls(user_id=user_id, poll_ids=poll_ids),
+        )
+
+        await record("active users refresh", active_users_repository.refresh())
+        await record(
+            "active users page",
+            active_users_repository.get_page(skip=8, limit=4, exclude_user_id=user_id),
+        )
+
+    def check_plan(self, label: str, explain: dict, max_ratio: float):
+        """
+        Returns the failures of an explain output.
+        """
+        stages: list = []
+        lookups: list = []
+        stats: list = []
+        self.walk(node=explain, stages=stages, lookups=lookups, stats=stats)
+
+        failures: list = []
+
+        if "COLLSCAN" in stages:
+            failures.append(f"{label}: COLLSCAN")
+
+        for lookup in lookups:
+            if lookup.get("collectionScans"):
+                collection: str = lookup["$lookup"]["from"]
+                failures.append(f"{label}: $lookup on '{collection}' scans the collection")
+
+        for stat in stats:
+            examined: int = stat.get("totalDocsExamined", 0)
+            returned: int = stat.get("nReturned", 0)
+            ratio: float = examined / max(returned, 1)
+            if ratio > max_ratio:
+                failures.append(
+                    f"{label}: {examined} documents examined for {returned} returned ({ratio:.1f})"
+                )
+
+        self.stdout.write(f"{label}: {', '.join(dict.fromkeys(stages)) or '-'}")
+
+        return failures
+
+    def walk(self, node, stages: list, lookups: list, stats: list):
+        """
+        Collects the plan stage names, '$lookup' stages and execution stats of an explain.
+        """
+        if isinstance(node, list):
+            for item in node:
+                self.walk(node=item, stages=stages, lookups=lookups, stats=stats)
+            return
+
+        if not isinstance(node, dict):
+            return
+
+        if "stage" in node:
+            stages.append(node["stage"])
+        if "$lookup" in node:
+            lookups.append(node)
+        if "totalDocsExamined" in node and "nReturned" in node:
+            stats.append(node)
+
+        for key, value in node.items():
+            # Only the winning plan matters.
+            if key != "rejectedPlans":
+                self.walk(node=value, stages=stages, lookups=lookups, stats=stats)
@@ -0,0 +1,154 @@
+import asyncio
+
+from django.core.management.base import BaseCommand, CommandError
+
+from pymongo import IndexModel
+from pymongo.errors import OperationFailure
+
+from apps.polls.repositories.indexes import INDEX_REGISTRY
+from utils.mongo_connection import MongoDBSingleton
+
+
+# Options that make two indexes with the same keys different.
+INDEX_OPTIONS: tuple = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds")
+
+
+class Command(BaseCommand):
+    """
+    Builds the indexes declared by the repositories ('INDEX_REGISTRY').
+
+    Each declared index is compared by keys and options with the existing indexes
+    ('index_information()') and reported as:
+        =  already exists.
+        +  missing, it is built unless '--dry-run' is given.
+        !  an index with the same keys or name exists with other options, it must be
+           dropped by hand before the declared one can be built.
+        ?  exists but it is not declared (reported only, never dropped).
+
+    Example:
+        python manage.py ensure_indexes --dry-run
+        python manage.py ensure_indexes --collection user_actions --background
+    """
+
+    help = "Diffs and builds the MongoDB indexes declared by the repositories."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--collection",
+            action="append",
+            default=[],
+            choices=list(INDEX_REGISTRY),
+            help="Only this collection.",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Only print the diff.")
+        parser.add_argument(
+            "--background",
+            action="store_true",
+            help="Build with the 'background' option (servers older than MongoDB 4.2).",
+        )
+
+    def handle(self, *args, **options):
+        asyncio.run(
+            self.run(
+                collections=options["collection"] or list(INDEX_REGISTRY),
+                dry_run=options["dry_run"],
+                background=options["background"],
+            )
+        )
+
+    async def run(self, collections: list, dry_run: bool, background: bool):
+        polls_db = MongoDBSingleton().client["polls_db"]
+
+        failed: bool = False
+
+        for name in collections:
+            collection = polls_db[name]
+            existing: dict = await collection.index_information()
+            missing, conflicts = self.diff(name=name, declared=INDEX_REGISTRY[name], existing=existing)
+
+            if conflicts:
+                failed = True
+
+            if dry_run or not missing:
+                continue
+
+            if background:
+                missing = [self.with_background(model=model) for model in missing]
+
+            try:
+                names: list = await collection.create_indexes(missing)
+                self.stdout.write(self.style.SUCCESS(f"{name}: built {', '.join(names)}"))
+
+            except OperationFailure as error:
+                # For example, duplicated documents for a unique index.
+                failed = True
+                self.stderr.write(f"{name}: build failed: {error}")
+
+        if failed:
+            raise CommandError("Some declared indexes could not be built.")
+
+    def diff(self, name: str, declared: list, existing: dict):
+        """
+        Prints the diff of a collection, returns the missing and conflicting indexes.
+        """
+        existing_specs: dict = {
+            index_name: self.get_spec(info) for index_name, info in existing.items()
+        }
+        matched: set = {"_id_"}
+        missing: list = []
+        conflicts: list = []
+
+        for model in declared:
+            document: dict = model.document
+            keys, options = self.get_spec(document)
+
+            same_keys: list = [n for n, spec in existing_specs.items() if spec[0] == keys]
+            same: list = [n for n in same_keys if existing_specs[n][1] == options]
+
+            if same:
+                matched.update(same)
+                self.stdout.write(f"{name}: = {same[0]}")
+
+            elif same_keys or document["name"] in existing_specs:
+                other: str = same_keys[0] if same_keys else document["name"]
+                matched.add(other)
+                conflicts.append(model)
+                self.stdout.write(
+                    self.style.WARNING(f"{name}: ! {document['name']} conflicts with {other}")
+                )
+
+            else:
+                missing.append(model)
+                self.stdout.write(f"{name}: + {document['name']}")
+
+        for index_name in existing_specs:
+            if index_name not in matched:
+                self.stdout.write(f"{name}: ? {index_name} is not declared")
+
+        return missing, conflicts
+
+    def get_spec(self, document: dict):
+        """
+        Normalizes an index document (declared or from 'index_information()') to a
+        comparable (keys, options) tuple.
+        """
+        keys = document["key"]
+        keys: list = list(keys.items()) if isinstance(keys, dict) else list(keys)
+
+        # The server stores text indexes as '_fts'/'_ftsx' keys plus the text field weights.
+        if any(field == "_fts" for field, _ in keys):
+            text: list = [(field, "text") for field in sorted(document.get("weights", {}))]
+            keys = [k for k in keys if k[0] not in ("_fts", "_ftsx")] + text
+        elif any(direction == "text" for _, direction in keys):
+            text: list = sorted(k for k in keys if k[1] == "text")
+            keys = [k for k in keys if k[1] != "text"] + text
+
+        options: dict = {key: document[key] for key in INDEX_OPTIONS if document.get(key)}
+
+        return tuple((field, direction) for field, direction in keys), options
+
+    def with_background(self, model: IndexModel):
+        document: dict = dict(model.document)
+        keys: list = list(document.pop("key").items())
+
+        return IndexModel(keys, background=True, **document)
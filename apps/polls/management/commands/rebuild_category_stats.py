@@ -0,0 +1,34 @@
+import asyncio
+
+from django.core.management.base import BaseCommand
+
+from apps.polls.repositories.category_stats_repository import CategoryStatsRepository
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the 'category_stats' counters from the 'polls' collection.
+
+    Use it when the counters drifted (e.g. a process died between a poll write and the
+    counter update). Run it while polls are not being written.
+
+    Example:
+        python manage.py rebuild_category_stats
+    """
+
+    help = "Rebuilds the number of polls and votes of each category."
+
+    def handle(self, *args, **options):
+        asyncio.run(self.run())
+
+    async def run(self):
+        repository = CategoryStatsRepository()
+        await repository.rebuild()
+
+        stats: dict = await repository.get_all()
+        for category, counters in sorted(stats.items()):
+            self.stdout.write(
+                f"{category}: {counters['total_polls']} polls, {counters['total_votes']} votes"
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"{len(stats)} categories rebuilt."))
@@ -0,0 +1,134 @@
+import asyncio
+
+from bson.objectid import ObjectId
+from bson.errors import InvalidId
+
+from django.core.management.base import BaseCommand, CommandError
+
+from pymongo import ASCENDING, UpdateOne
+
+from utils.mongo_connection import MongoDBSingleton
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the vote counters of the poll documents from 'user_actions'.
+
+    'votes_counter' and the votes of every option are set to the number of votes stored
+    in 'user_actions'. Use it after a process running the "buffered" vote engine died
+    with unflushed counters. Run it while votes are not being written, a flush that
+    happens after the rebuild would apply its deltas a second time.
+
+    Example:
+        python manage.py rebuild_vote_counters
+        python manage.py rebuild_vote_counters --poll 65f0c0ffee0000000000abcd --dry-run
+    """
+
+    help = "Rebuilds the poll vote counters from the votes stored in user_actions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--poll", action="append", default=[], help="Only this poll ID.")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        try:
+            poll_ids: list = [ObjectId(id) for id in options["poll"]]
+        except InvalidId as error:
+            raise CommandError(f"Invalid poll ID: {error}")
+
+        asyncio.run(
+            self.run(
+                poll_ids=poll_ids,
+                batch_size=options["batch_size"],
+                dry_run=options["dry_run"],
+            )
+        )
+
+    async def run(self, poll_ids: list, batch_size: int, dry_run: bool):
+        polls_db = MongoDBSingleton().client["polls_db"]
+
+        query: dict = {"_id": {"$in": poll_ids}} if poll_ids else {}
+        cursor = polls_db.polls.find(
+            query,
+            projection={"votes_counter": 1, "options.option_text": 1, "options.votes": 1},
+            sort=[("_id", ASCENDING)],
+            batch_size=batch_size,
+        )
+
+        checked: int = 0
+        fixed: int = 0
+        batch: list = []
+
+        async for poll in cursor:
+            batch.append(poll)
+            if len(batch) >= batch_size:
+                fixed += await self.rebuild_batch(polls_db=polls_db, polls=batch, dry_run=dry_run)
+                checked += len(batch)
+                batch = []
+
+        if batch:
+            fixed += await self.rebuild_batch(polls_db=polls_db, polls=batch, dry_run=dry_run)
+            checked += len(batch)
+
+        action: str = "would be fixed" if dry_run else "fixed"
+        self.stdout.write(self.style.SUCCESS(f"{checked} polls checked, {fixed} {action}."))
+
+    async def rebuild_batch(self, polls_db, polls: list, dry_run: bool):
+        counts: list = await polls_db.user_actions.aggregate(
+            [
+                {
+                    "$match": {
+                        "poll_id": {"$in": [poll["_id"] for poll in polls]},
+                        "has_voted": {"$exists": True},
+                    }
+                },
+                {
+                    "$group": {
+                        "_id": {"poll_id": "$poll_id", "vote": "$has_voted.vote"},
+                        "count": {"$sum": 1},
+                    }
+                },
+            ]
+        ).to_list(length=None)
+
+        votes: dict = {}
+        for count in counts:
+            votes.setdefault(count["_id"]["poll_id"], {})[count["_id"]["vote"]] = count["count"]
+
+        requests: list = []
+        for poll in polls:
+            poll_votes: dict = votes.get(poll["_id"], {})
+            options: list = poll.get("options", [])
+
+            total: int = sum(
+                poll_votes.get(option["option_text"], 0) for option in options
+            )
+            is_valid: bool = poll.get("votes_counter") == total and all(
+                option.get("votes") == poll_votes.get(option["option_text"], 0)
+                for option in options
+            )
+
+            if is_valid:
+                continue
+
+            self.stdout.write(f"{poll['_id']}: votes_counter {poll.get('votes_counter')} -> {total}")
+
+            values: dict = {"votes_counter": total}
+            array_filters: list = []
+            for index, option in enumerate(options):
+                values[f"options.$[o{index}].votes"] = poll_votes.get(option["option_text"], 0)
+                array_filters.append({f"o{index}.option_text": option["option_text"]})
+
+            requests.append(
+                UpdateOne(
+                    {"_id": poll["_id"]},
+                    {"$set": values, "$inc": {"version": 1}},
+                    array_filters=array_filters or None,
+                )
+            )
+
+        if requests and not dry_run:
+            await polls_db.polls.bulk_write(requests, ordered=False)
+
+        return len(requests)
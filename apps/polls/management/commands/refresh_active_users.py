@@ -0,0 +1,29 @@
+import asyncio
+
+from django.core.management.base import BaseCommand
+
+from apps.polls.repositories.active_users_repository import ActiveUsersRepository
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the 'active_users' ranking read by the explore users endpoint.
+
+    The ranking is not updated by the user actions, run the command periodically
+    (e.g. from cron).
+
+    Example:
+        python manage.py refresh_active_users
+    """
+
+    help = "Rebuilds the active users ranking from user_actions."
+
+    def handle(self, *args, **options):
+        asyncio.run(self.run())
+
+    async def run(self):
+        repository = ActiveUsersRepository()
+        await repository.refresh()
+
+        total: int = await repository.polls_db.active_users.estimated_document_count()
+        self.stdout.write(self.style.SUCCESS(f"{total} active users ranked."))
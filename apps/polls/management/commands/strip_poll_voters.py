@@ -0,0 +1,75 @@
+import asyncio
+
+from django.core.management.base import BaseCommand
+
+from pymongo import ASCENDING
+
+from utils.mongo_connection import MongoDBSingleton
+
+
+class Command(BaseCommand):
+    """
+    Removes the 'voters' array from the poll documents.
+
+    The voters of a poll are stored in 'user_actions', the array duplicated them in the
+    poll document and grew without bound. Polls are updated in batches of '_id' ranges,
+    so the command can be stopped and run again at any time.
+
+    Example:
+        python manage.py strip_poll_voters --batch-size 1000
+        python manage.py strip_poll_voters --dry-run
+    """
+
+    help = "Removes the 'voters' array from the poll documents, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--pause", type=float, default=0, help="Seconds between batches.")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        asyncio.run(
+            self.run(
+                batch_size=options["batch_size"],
+                pause=options["pause"],
+                dry_run=options["dry_run"],
+            )
+        )
+
+    async def run(self, batch_size: int, pause: float, dry_run: bool):
+        polls_db = MongoDBSingleton().client["polls_db"]
+
+        query: dict = {"voters": {"$exists": True}}
+
+        if dry_run:
+            count: int = await polls_db.polls.count_documents(query)
+            self.stdout.write(self.style.SUCCESS(f"{count} polls would be updated."))
+            return
+
+        updated: int = 0
+        last_id = None
+
+        while True:
+            batch_query: dict = {**query, "_id": {"$gt": last_id}} if last_id else query
+            ids: list = [
+                poll["_id"]
+                async for poll in polls_db.polls.find(
+                    batch_query, projection={"_id": 1}, sort=[("_id", ASCENDING)], limit=batch_size
+                )
+            ]
+
+            if not ids:
+                break
+
+            result = await polls_db.polls.update_many(
+                {"_id": {"$in": ids}}, {"$unset": {"voters": ""}}
+            )
+            updated += result.modified_count
+            last_id = ids[-1]
+
+            self.stdout.write(f"{updated} polls updated...")
+
+            if pause:
+                await asyncio.sleep(pause)
+
+        self.stdout.write(self.style.SUCCESS(f"{updated} polls updated."))
@@ -0,0 +1,166 @@
+import asyncio
+import random
+from datetime import datetime
+
+from bson.objectid import ObjectId
+
+from django.core.management.base import BaseCommand, CommandError
+
+from rest_framework.exceptions import ValidationError
+
+from apps.polls.repositories.atomic_vote_repository import AtomicVoteRepository
+from apps.polls.repositories.user_actions_repository import UserActionsRepository
+from utils.mongo_connection import MongoDBSingleton
+
+
+class Command(BaseCommand):
+    """
+    Concurrent vote harness.
+
+    Runs random add/update/delete vote sequences for many users against one poll of a
+    scratch database, sending every request several times at once to simulate retries
+    and double clicks. Then checks that the poll counters match the votes stored in
+    'user_actions'. Needs a running mongod ('MONGO_URI'), the "transaction" engine
+    also needs a replica set.
+
+    Example:
+        python manage.py vote_harness --engine atomic --users 500 --duplicates 4
+    """
+
+    help = "Checks the vote engine counters under concurrent, duplicated requests."
+
+    options_text: list = ["Option A", "Option B", "Option C"]
+
+    def add_arguments(self, parser):
+        parser.add_argument("--engine", choices=["atomic", "transaction"], default="atomic")
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--rounds", type=int, default=5, help="Vote operations per user.")
+        parser.add_argument("--duplicates", type=int, default=3, help="Copies of each request.")
+        parser.add_argument("--database", default="polls_vote_harness")
+        parser.add_argument("--seed", type=int, default=None)
+        parser.add_argument("--keep", action="store_true", help="Don't drop the database.")
+
+    def handle(self, *args, **options):
+        if options["database"] == "polls_db":
+            raise CommandError("The harness database can't be the application database.")
+
+        random.seed(options["seed"])
+        asyncio.run(self.run(**options))
+
+    async def run(
+        self, engine: str, users: int, rounds: int, duplicates: int, database: str, **kwargs
+    ):
+        client = MongoDBSingleton().client
+        polls_db = client[database]
+
+        if engine == "atomic":
+            repository = AtomicVoteRepository()
+        else:
+            repository = UserActionsRepository()
+        repository.polls_db = polls_db
+
+        await client.drop_database(database)
+        await polls_db.user_actions.create_indexes(UserActionsRepository.INDEXES)
+
+        poll_id: str = await self.create_poll(polls_db=polls_db)
+
+        stats: dict = {"applied": 0, "rejected": 0, "errors": 0}
+        started: float = asyncio.get_running_loop().time()
+
+        await asyncio.gather(
+            *(
+                self.run_user(repository, polls_db, poll_id, user_id, rounds, duplicates, stats)
+                for user_id in range(1, users + 1)
+            )
+        )
+
+        elapsed: float = asyncio.get_running_loop().time() - started
+        mismatches: list = await self.check_counters(polls_db=polls_db, poll_id=poll_id)
+
+        if not kwargs.get("keep"):
+            await client.drop_database(database)
+
+        self.stdout.write(
+            f"engine={engine} users={users} rounds={rounds} duplicates={duplicates} "
+            f"applied={stats['applied']} rejected={stats['rejected']} errors={stats['errors']} "
+            f"elapsed={elapsed:.2f}s"
+        )
+
+        if mismatches:
+            for mismatch in mismatches:
+                self.stderr.write(mismatch)
+            raise CommandError("Poll counters don't match the stored votes.")
+
+        self.stdout.write(self.style.SUCCESS("Poll counters match the stored votes."))
+
+    async def create_poll(self, polls_db) -> str:
+        result = await polls_db.polls.insert_one(
+            {
+                "title": "Vote harness",
+                "privacy": "public",
+                "category": "technology",
+                "user_id": 0,
+                "created_at": datetime.now(),
+                "options": [{"user_id": 0, "option_text": o, "votes": 0} for o in self.options_text],
+                "votes_counter": 0,
+                "shares_counter": 0,
+                "bookmarks_counter": 0,
+                "comments_counter": 0,
+            }
+        )
+
+        return str(result.inserted_id)
+
+    async def run_user(self, repository, polls_db, poll_id, user_id, rounds, duplicates, stats):
+        for _ in range(rounds):
+            actions: dict | None = await polls_db.user_actions.find_one(
+                {"user_id": user_id, "poll_id": ObjectId(poll_id)},
+                projection={"_id": 0, "has_voted": 1},
+            )
+            current: str | None = None
+            if actions and "has_voted" in actions:
+                current = actions["has_voted"]["vote"]
+            vote: str = random.choice(self.options_text)
+
+            if current is None:
+                request = lambda: repository.insert_vote(id=poll_id, user_id=user_id, vote=vote)
+            elif random.random() < 0.5:
+                request = lambda: repository.update_vote(
+                    id=poll_id, user_id=user_id, vote=vote, del_vote=current
+                )
+            else:
+                request = lambda: repository.delete_vote(
+                    id=poll_id, user_id=user_id, del_vote=current
+                )
+
+            results: list = await asyncio.gather(
+                *(request() for _ in range(duplicates)), return_exceptions=True
+            )
+
+            for result in results:
+                if isinstance(result, ValidationError):
+                    stats["rejected"] += 1
+                elif isinstance(result, Exception):
+                    stats["errors"] += 1
+                else:
+                    stats["applied"] += 1
+
+    async def check_counters(self, polls_db, poll_id: str):
+        poll: dict = await polls_db.polls.find_one({"_id": ObjectId(poll_id)})
+        votes: list = await polls_db.user_actions.find(
+            {"poll_id": ObjectId(poll_id), "has_voted": {"$exists": True}},
+            projection={"_id": 0, "user_id": 1, "has_voted": 1},
+        ).to_list(length=None)
+
+        mismatches: list = []
+
+        if poll["votes_counter"] != len(votes):
+            mismatches.append(f"votes_counter={poll['votes_counter']} expected={len(votes)}")
+
+        for option in poll["options"]:
+            expected: int = sum(1 for v in votes if v["has_voted"]["vote"] == option["option_text"])
+            if option["votes"] != expected:
+                mismatches.append(f"{option['option_text']}={option['votes']} expected={expected}")
+
+        return mismatches
+
@@ -0,0 +1,101 @@
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from utils.mongo_connection import MongoDBSingleton
+
+
+class ActiveUsersRepository:
+    """
+    Repository for the 'active_users' collection, a ranking of the users with actions
+    (votes, shares, bookmarks) on polls.
+
+    The collection is precomputed from 'user_actions' by 'refresh' (see the
+    'refresh_active_users' command), each document has a contiguous 'rank' starting at 1,
+    so a page of the ranking is an indexed range read.
+
+    Document example: { _id: user_id, actions_counter: int, last_action_at: datetime, rank: int }
+    """
+
+    polls_db = MongoDBSingleton().client["polls_db"]
+
+    # Indexes of the 'active_users' collection, built by the 'ensure_indexes' command.
+    INDEXES: list = [
+        IndexModel([("rank", ASCENDING)]),
+    ]
+
+    async def refresh(self):
+        """
+        Rebuilds the ranking from 'user_actions' (MongoDB 5.0+).
+
+        The result replaces the collection atomically ('$out'), its indexes are kept.
+        Users are ranked by number of polls with actions, then by the date of the last action.
+        """
+        await self.polls_db.user_actions.aggregate(
+            [
+                {
+                    "$match": {
+                        "$or": [
+                            {"has_voted": {"$exists": True}},
+                            {"has_shared": {"$exists": True}},
+                            {"has_bookmarked": {"$exists": True}},
+                        ]
+                    }
+                },
+                {
+                    "$group": {
+                        "_id": "$user_id",
+                        "actions_counter": {"$sum": 1},
+                        "last_action_at": {
+                            "$max": {
+                                "$max": [
+                                    "$has_voted.voted_at",
+                                    "$has_shared.shared_at",
+                                    "$has_bookmarked.bookmarked_at",
+                                ]
+                            }
+                        },
+                    }
+                },
+                {
+                    "$setWindowFields": {
+                        "sortBy": {"actions_counter": DESCENDING, "last_action_at": DESCENDING},
+                        "output": {"rank": {"$documentNumber": {}}},
+                    }
+                },
+                {"$out": "active_users"},
+            ]
+        ).to_list(length=None)
+
+    async def get_page(
+        self, skip: int = 0, limit: int = 0, exclude_user_id: int | None = None
+    ) -> tuple[list[int], int]:
+        """
+        Returns the user IDs of one page of the ranking and the total number of users.
+
+        Args:
+            skip (int): The number of users to skip.
+            limit (int): The maximum number of users to return (0 means no limit).
+            exclude_user_id (int): A user to leave out of the ranking (the viewer).
+        """
+        total: int = await self.polls_db.active_users.estimated_document_count()
+        start: int = skip + 1
+
+        if exclude_user_id is not None:
+            excluded: dict | None = await self.polls_db.active_users.find_one(
+                {"_id": exclude_user_id}, projection={"rank": 1}
+            )
+
+            # The users ranked after the excluded one move up one position.
+            if excluded:
+                total -= 1
+                if excluded["rank"] <= start:
+                    start += 1
+
+        query: dict = {"rank": {"$gte": start}}
+        if exclude_user_id is not None:
+            query["_id"] = {"$ne": exclude_user_id}
+
+        users: list = await self.polls_db.active_users.find(
+            query, projection={"_id": 1}, sort=[("rank", ASCENDING)], limit=limit
+        ).to_list(length=None)
+
+        return [user["_id"] for user in users], total
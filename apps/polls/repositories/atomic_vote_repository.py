@@ -0,0 +1,164 @@
+from datetime import datetime
+
+from bson import BSON
+from bson.objectid import ObjectId
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from django.core.exceptions import ImproperlyConfigured
+
+from rest_framework.exceptions import ValidationError
+
+from utils.mongo_connection import MongoDBSingleton
+
+
+class AtomicVoteRepository:
+    """
+    Vote engine that does not use multi-document transactions.
+
+    Each operation is a conditional single-document write on 'user_actions' followed by
+    one update on the poll document, which is only applied if the first write changed
+    the vote state. Idempotency relies on the unique '(user_id, poll_id)' index of the
+    'user_actions' collection: concurrent duplicates of the same request match at most
+    once, so the poll counters move at most once. Votes are refused while the index is
+    missing ('check_unique_index').
+
+    Each write of a user actions document increments its 'version' (see
+    'UserActionsRepository').
+
+    If the process dies between the two writes the poll counters drift from
+    'user_actions', the counters can then be rebuilt from 'user_actions'.
+    """
+
+    polls_db = MongoDBSingleton().client["polls_db"]
+
+    # Set once the unique index has been found, see 'check_unique_index'.
+    unique_index_checked: bool = False
+
+    async def check_unique_index(self):
+        """
+        Raises 'ImproperlyConfigured' if the unique '(user_id, poll_id)' index of
+        'user_actions' is missing (built by the 'ensure_indexes' command). Without it,
+        concurrent duplicate votes create several user actions documents silently and
+        the poll counters drift.
+
+        The index is looked up once per process.
+        """
+        if AtomicVoteRepository.unique_index_checked:
+            return
+
+        indexes: dict = await self.polls_db.user_actions.index_information()
+
+        if not any(
+            index.get("unique") and [field for field, _ in index["key"]] == ["user_id", "poll_id"]
+            for index in indexes.values()
+        ):
+            raise ImproperlyConfigured(
+                "The unique (user_id, poll_id) index of 'user_actions' is missing, "
+                "run 'python manage.py ensure_indexes'."
+            )
+
+        AtomicVoteRepository.unique_index_checked = True
+
+    async def insert_vote(self, id: str, user_id: int, vote: str):
+        await self.check_unique_index()
+
+        try:
+            # Only matches (or creates) a user actions document without a vote.
+            result = await self.polls_db.user_actions.update_one(
+                {"user_id": user_id, "poll_id": ObjectId(id), "has_voted": {"$exists": False}},
+                {
+                    "$set": {"has_voted": {"vote": vote, "voted_at": datetime.now()}},
+                    "$inc": {"version": 1},
+                },
+                upsert=True,
+            )
+
+        except DuplicateKeyError:
+            # The document exists and already has a vote.
+            result = None
+
+        if (result is None) or (not result.modified_count and result.upserted_id is None):
+            message: str = "The user has already voted in this poll."
+            raise ValidationError(detail={"message": message})
+
+        await self.count_vote(id=id, user_id=user_id, vote=vote)
+
+        return ObjectId(id)
+
+    async def update_vote(self, id: str, user_id: int, vote: str, del_vote: str):
+        if vote == del_vote:
+            return ObjectId(id)
+
+        # Compare and swap, only replaces the vote the caller has seen.
+        result: BSON = await self.polls_db.user_actions.find_one_and_update(
+            {"user_id": user_id, "poll_id": ObjectId(id), "has_voted.vote": del_vote},
+            {
+                "$set": {"has_voted": {"vote": vote, "voted_at": datetime.now()}},
+                "$inc": {"version": 1},
+            },
+            projection={"_id": 1},
+        )
+
+        if result is None:
+            message: str = "The user vote has changed, try again."
+            raise ValidationError(detail={"message": message})
+
+        await self.move_vote(id=id, user_id=user_id, vote=vote, del_vote=del_vote)
+
+        return ObjectId(id)
+
+    async def delete_vote(self, id: str, user_id: int, del_vote: str | None = None):
+        # Removes the vote and returns it, so the counters are decremented only once
+        # and always for the option that was really stored.
+        result: BSON = await self.polls_db.user_actions.find_one_and_update(
+            {"user_id": user_id, "poll_id": ObjectId(id), "has_voted": {"$exists": True}},
+            {"$unset": {"has_voted": ""}, "$inc": {"version": 1}},
+            projection={"_id": 0, "has_voted": 1},
+            return_document=ReturnDocument.BEFORE,
+        )
+
+        if result is None:
+            message: str = "The user has not voted in this poll."
+            raise ValidationError(detail={"message": message})
+
+        del_vote: str = result["has_voted"]["vote"]
+
+        await self.uncount_vote(id=id, user_id=user_id, del_vote=del_vote)
+
+        return ObjectId(id)
+
+    # Poll counters, called once the user actions document has been changed.
+
+    async def count_vote(self, id: str, user_id: int, vote: str):
+        await self.polls_db.polls.update_one(
+            {"_id": ObjectId(id), "options.option_text": vote},
+            {"$inc": {"votes_counter": 1, "options.$.votes": 1, "version": 1}},
+        )
+
+    async def move_vote(self, id: str, user_id: int, vote: str, del_vote: str):
+        await self.polls_db.polls.update_one(
+            {"_id": ObjectId(id)},
+            {
+                "$inc": {
+                    "options.$[del_vote].votes": -1,
+                    "options.$[vote].votes": 1,
+                    "version": 1,
+                }
+            },
+            array_filters=[{"del_vote.option_text": del_vote}, {"vote.option_text": vote}],
+        )
+
+    async def uncount_vote(self, id: str, user_id: int, del_vote: str):
+        await self.polls_db.polls.update_one(
+            {"_id": ObjectId(id)},
+            {
+                "$inc": {
+                    "votes_counter": -1,
+                    "options.$[del_vote].votes": -1,
+                    "version": 1,
+                }
+            },
+            array_filters=[{"del_vote.option_text": del_vote}],
+        )
@@ -0,0 +1,59 @@
+from bson import BSON
+
+from utils.mongo_connection import MongoDBSingleton
+
+
+class CategoryStatsRepository:
+    """
+    Repository for the 'category_stats' collection, the number of polls and votes of each
+    poll category.
+
+    The poll and vote write paths keep the counters up to date with '$inc', 'rebuild'
+    recomputes them from the 'polls' collection when they drift (see the
+    'rebuild_category_stats' command).
+
+    Document example: { _id: category, total_polls: int, total_votes: int }
+    """
+
+    polls_db = MongoDBSingleton().client["polls_db"]
+
+    async def increment(self, category: str, polls: int = 0, votes: int = 0):
+        """
+        Adds deltas to the counters of a category, creating its document if needed.
+        """
+        if not polls and not votes:
+            return
+
+        await self.polls_db.category_stats.update_one(
+            {"_id": category},
+            {"$inc": {"total_polls": polls, "total_votes": votes}},
+            upsert=True,
+        )
+
+    async def get_all(self) -> dict:
+        """
+        Returns the counters keyed by category.
+        """
+        stats: list[BSON] = await self.polls_db.category_stats.find().to_list(length=None)
+
+        return {category.pop("_id"): category for category in stats}
+
+    async def rebuild(self):
+        """
+        Recomputes the counters from the 'polls' collection.
+
+        The result replaces the collection atomically ('$out'), the increments applied
+        while the aggregation runs are lost, so run it when polls are not being written.
+        """
+        await self.polls_db.polls.aggregate(
+            [
+                {
+                    "$group": {
+                        "_id": "$category",
+                        "total_polls": {"$sum": 1},
+                        "total_votes": {"$sum": "$votes_counter"},
+                    }
+                },
+                {"$out": "category_stats"},
+            ]
+        ).to_list(length=None)
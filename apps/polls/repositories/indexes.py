@@ -0,0 +1,13 @@
+from apps.polls.repositories.active_users_repository import ActiveUsersRepository
+from apps.polls.repositories.poll_comment_repository import PollCommentRepository
+from apps.polls.repositories.poll_repository import PollRepository
+from apps.polls.repositories.user_actions_repository import UserActionsRepository
+
+
+# Declared indexes of each collection of 'polls_db', keyed by collection name.
+INDEX_REGISTRY: dict = {
+    "polls": PollRepository.INDEXES,
+    "user_actions": UserActionsRepository.INDEXES,
+    "comments": PollCommentRepository.INDEXES,
+    "active_users": ActiveUsersRepository.INDEXES,
+}
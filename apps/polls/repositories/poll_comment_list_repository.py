@@ -1,5 +1,9 @@
 from bson import BSON
+from bson.codec_options import CodecOptions
 from bson.objectid import ObjectId
+from bson.raw_bson import RawBSONDocument
+
+from django.conf import settings
 
 from pymongo import DESCENDING
 
@@ -9,10 +13,32 @@ from utils.mongo_connection import MongoDBSingleton
 class PollCommentListRepository:
     polls_db = MongoDBSingleton().client["polls_db"]
 
+    RAW_CODEC_OPTIONS = CodecOptions(document_class=RawBSONDocument)
+
+    def get_collection(self, name: str):
+        """
+        Returns a collection of 'polls_db', decoding documents as 'RawBSONDocument' if the
+        'POLL_LIST_RAW_BSON' setting is enabled.
+        """
+        if getattr(settings, "POLL_LIST_RAW_BSON", False):
+            return self.polls_db.get_collection(name, codec_options=self.RAW_CODEC_OPTIONS)
+
+        return self.polls_db[name]
+
     async def get_by_poll_id(self, id: str):
-        comments: list[BSON] = await self.polls_db.comments.find(
+        comments: list[BSON] = await self.get_collection("comments").find(
             {"poll_id": ObjectId(id)},
             sort=[("created_at", DESCENDING)],
         ).to_list(length=None)
 
         return comments
+
+    async def get_user_ids(self, id: str):
+        """
+        Returns the IDs of the authors of the comments of a poll.
+        """
+        user_ids: list[int] = await self.polls_db.comments.distinct(
+            "user_id", {"poll_id": ObjectId(id)}
+        )
+
+        return user_ids
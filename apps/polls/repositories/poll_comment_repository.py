@@ -3,6 +3,8 @@ from datetime import datetime
 from bson import BSON
 from bson.objectid import ObjectId
 
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
 from rest_framework.exceptions import NotFound
 
 from utils.mongo_connection import MongoDBSingleton
@@ -11,6 +13,11 @@ from utils.mongo_connection import MongoDBSingleton
 class PollCommentRepository:
     polls_db = MongoDBSingleton().client["polls_db"]
 
+    # Indexes of the 'comments' collection, built by the 'ensure_indexes' command.
+    INDEXES: list = [
+        IndexModel([("poll_id", ASCENDING), ("created_at", DESCENDING)]),
+    ]
+
     async def create(self, poll_id: str, user_id: int, comment: str):
         """
         Creates a new poll comment.
@@ -24,6 +31,7 @@ class PollCommentRepository:
                         "comment": comment,
                         "created_at": datetime.now(),
                         "poll_id": ObjectId(poll_id),
+                        "version": 1,
                     },
                     session=session,
                 )
@@ -31,7 +39,7 @@ class PollCommentRepository:
                 # Add count to comment counter in the poll document.
                 await self.polls_db.polls.update_one(
                     {"_id": ObjectId(poll_id)},
-                    {"$inc": {"comments_counter": 1}},
+                    {"$inc": {"comments_counter": 1, "version": 1, "comments_version": 1}},
                     session=session,
                 )
 
@@ -55,10 +63,16 @@ class PollCommentRepository:
 
         return comment
 
-    async def update(self, id: str, comment: str):
+    async def update(self, id: str, poll_id: str, comment: str):
         await self.polls_db.comments.update_one(
             {"_id": ObjectId(id)},
-            {"$set": {"comment": comment}},
+            {"$set": {"comment": comment}, "$inc": {"version": 1}},
+        )
+
+        # The comment list of the poll has changed.
+        await self.polls_db.polls.update_one(
+            {"_id": ObjectId(poll_id)},
+            {"$inc": {"comments_version": 1}},
         )
 
         return ObjectId(id)
@@ -75,7 +89,7 @@ class PollCommentRepository:
                 # Remove count to comment counter in the poll document.
                 await self.polls_db.polls.update_one(
                     {"_id": ObjectId(poll_id)},
-                    {"$inc": {"comments_counter": -1}},
+                    {"$inc": {"comments_counter": -1, "version": 1, "comments_version": 1}},
                     session=session,
                 )
 
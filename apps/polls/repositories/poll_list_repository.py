@@ -1,132 +1,449 @@
+from datetime import datetime
+
 from bson import BSON
+from bson.objectid import ObjectId
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+
+from django.conf import settings
 
 from pymongo import DESCENDING
 
+from apps.polls.repositories.projections import POLL_CARD_PROJECTION
 from utils.mongo_connection import MongoDBSingleton
 
 
 class PollListRepository:
+    """
+    Repository for paginated poll list queries.
+
+    The 'get_by_*' methods slice the result set on the server and return a tuple with
+    the requested page of polls and the total number of matching polls. The
+    'get_*_after' methods implement keyset (cursor) pagination on the same feeds.
+
+    With the 'POLL_LIST_RAW_BSON' setting, the documents are returned as read-only
+    'RawBSONDocument' mappings.
+
+    With 'with_user_actions', each returned poll also carries the viewer's user actions
+    in 'authenticated_user_actions' (a list with zero or one document), joined by the
+    same aggregation.
+    """
+
     polls_db = MongoDBSingleton().client["polls_db"]
 
-    async def get_by_keyword(self, keyword: str, user_id: int) -> list[BSON]:
-        polls: list = await self.polls_db.polls.find(
+    # Sort orders, the trailing '_id' makes them total so they can be used as keysets.
+    RECENT_SORT: list = [("created_at", DESCENDING), ("_id", DESCENDING)]
+    POPULAR_SORT: list = [("votes_counter", DESCENDING), ("_id", DESCENDING)]
+
+    # Types of the sort keys, the values of a decoded cursor must match them.
+    KEY_TYPES: dict = {"created_at": (datetime,), "votes_counter": (int,), "_id": (ObjectId,)}
+
+    RAW_CODEC_OPTIONS = CodecOptions(document_class=RawBSONDocument)
+
+    def get_collection(self, name: str):
+        """
+        Returns a collection of 'polls_db', decoding documents as 'RawBSONDocument' if the
+        'POLL_LIST_RAW_BSON' setting is enabled.
+        """
+        if getattr(settings, "POLL_LIST_RAW_BSON", False):
+            return self.polls_db.get_collection(name, codec_options=self.RAW_CODEC_OPTIONS)
+
+        return self.polls_db[name]
+
+    def get_key_types(self, sort: list) -> list:
+        """
+        Returns the types of the keys of a sort order, see 'Pagination.decode_cursor'.
+        """
+        return [self.KEY_TYPES[field] for field, _ in sort]
+
+    def keyset_filter(self, sort: list, values: list) -> dict:
+        """
+        Builds the filter that matches the documents placed after 'values' in 'sort' order.
+
+        Example for [("created_at", -1), ("_id", -1)]:
+            {"$or": [{"created_at": {"$lt": v0}}, {"created_at": v0, "_id": {"$lt": v1}}]}
+        """
+        clauses: list = []
+        for index, (field, direction) in enumerate(sort):
+            clause: dict = {f: v for (f, _), v in zip(sort[:index], values[:index])}
+            clause[field] = {"$lt" if direction == DESCENDING else "$gt": values[index]}
+            clauses.append(clause)
+
+        return {"$or": clauses}
+
+    def privacy_filter(self, user_id: int | None, owner_id: int | None = None, prefix: str = ""):
+        """
+        Builds the filter that matches the polls 'user_id' is allowed to see.
+
+        The simplest shape is returned for each case, so the feed can be served by an
+        ordered index scan:
+            - the viewer is the owner ('owner_id'): no filter.
+            - anonymous viewer, or polls of another user: public polls only.
+            - otherwise: public polls, and the private polls of the viewer.
+
+        Args:
+            user_id (int): The ID of the viewer, None for anonymous viewers.
+            owner_id (int): The ID of the poll owner, if the feed is restricted to one user.
+            prefix (str): The path of the poll document, e.g. "poll." after a '$lookup'.
+        """
+        if owner_id is not None and owner_id == user_id:
+            return {}
+
+        if not user_id or owner_id is not None:
+            return {f"{prefix}privacy": "public"}
+
+        return {
+            "$or": [
+                {f"{prefix}privacy": "public"},
+                {f"{prefix}privacy": "private", f"{prefix}user_id": user_id},
+            ]
+        }
+
+    def user_actions_lookup(self, user_id: int) -> dict:
+        """
+        Builds the '$lookup' stage that joins the user actions of 'user_id' to each poll.
+        """
+        return {
+            "$lookup": {
+                "from": "user_actions",
+                "let": {"poll_id": "$_id"},
+                "pipeline": [
+                    {"$match": {"user_id": user_id, "$expr": {"$eq": ["$poll_id", "$$poll_id"]}}},
+                    {"$project": {"_id": 0, "has_voted": 1, "has_shared": 1, "has_bookmarked": 1}},
+                ],
+                "as": "authenticated_user_actions",
+            }
+        }
+
+    async def find_after(
+        self,
+        collection,
+        match: dict,
+        sort: list,
+        after: list | None = None,
+        limit: int = 0,
+        actions_user_id: int | None = None,
+        projection: dict = POLL_CARD_PROJECTION,
+    ) -> list[BSON]:
+        """
+        Returns up to 'limit' documents that come after the 'after' keyset in 'sort' order.
+
+        Args:
+            collection: The Motor collection to query.
+            match (dict): The feed filter.
+            sort (list): The sort order, a list of (field, direction) tuples.
+            after (list): The sort key values of the last document already returned.
+            limit (int): The maximum number of documents to return (0 means no limit).
+            actions_user_id (int): If given, joins the user actions of this user to each poll.
+            projection (dict): The poll fields to return (poll cards by default).
+        """
+        if after:
+            match = {**match, "$and": [self.keyset_filter(sort=sort, values=after)]}
+
+        if actions_user_id is None:
+            polls: list[BSON] = await collection.find(
+                match, projection=projection, sort=sort, limit=limit
+            ).to_list(length=None)
+
+            return polls
+
+        pipeline: list = [{"$match": match}, {"$sort": dict(sort)}]
+        if limit:
+            pipeline.append({"$limit": limit})
+        pipeline.append({"$project": projection})
+        pipeline.append(self.user_actions_lookup(user_id=actions_user_id))
+
+        polls: list[BSON] = await collection.aggregate(pipeline).to_list(length=None)
+
+        return polls
+
+    async def aggregate_page(
+        self,
+        collection,
+        pipeline: list,
+        skip: int = 0,
+        limit: int = 0,
+        actions_user_id: int | None = None,
+        projection: dict = POLL_CARD_PROJECTION,
+    ) -> tuple[list[BSON], int]:
+        """
+        Runs an aggregation pipeline and returns one page of it with the total count.
+
+        The page and the count are computed in a single '$facet' stage, so only the
+        requested documents are sent over the wire.
+
+        Args:
+            collection: The Motor collection to aggregate on.
+            pipeline (list): The stages that produce the full, sorted result set.
+            skip (int): The number of documents to skip.
+            limit (int): The maximum number of documents to return (0 means no limit).
+            actions_user_id (int): If given, joins the user actions of this user to each poll
+                of the page.
+            projection (dict): The poll fields to return (poll cards by default).
+        """
+        items_pipeline: list = [{"$skip": skip}]
+        if limit:
+            items_pipeline.append({"$limit": limit})
+        items_pipeline.append({"$project": projection})
+        if actions_user_id is not None:
+            items_pipeline.append(self.user_actions_lookup(user_id=actions_user_id))
+
+        facet: dict = {
+            "$facet": {
+                "items": items_pipeline,
+                "total": [{"$count": "count"}],
+            }
+        }
+
+        result: list = await collection.aggregate([*pipeline, facet]).to_list(length=1)
+
+        if not result:
+            return [], 0
+
+        polls: list[BSON] = result[0]["items"]
+        total: int = result[0]["total"][0]["count"] if result[0]["total"] else 0
+
+        return polls, total
+
+    async def get_by_keyword(
+        self,
+        keyword: str,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 0,
+        with_user_actions: bool = False,
+    ) -> tuple[list[BSON], int]:
+        pipeline: list = [
             {
-                "$text": {"$search": keyword},
-                "$or": [{"privacy": "public"}, {"privacy": "private", "user_id": user_id}],
+                "$match": {
+                    "$text": {"$search": keyword},
+                    **self.privacy_filter(user_id=user_id),
+                }
             },
-            sort=[("votes", DESCENDING)],
-        ).to_list(None)
+            {"$sort": dict(self.POPULAR_SORT)},
+        ]
 
-        return polls
+        return await self.aggregate_page(
+            collection=self.get_collection("polls"),
+            pipeline=pipeline,
+            skip=skip,
+            limit=limit,
+            actions_user_id=user_id if with_user_actions else None,
+        )
 
-    async def get_by_user_id(self, id: int, user_id: int) -> list[BSON]:
-        polls: list = await self.polls_db.polls.find(
+    async def get_by_user_id(
+        self,
+        id: int,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 0,
+        with_user_actions: bool = False,
+    ) -> tuple[list[BSON], int]:
+        pipeline: list = [
             {
-                "user_id": id,
-                "$or": [
-                    {"privacy": "public"},
-                    {"privacy": "private", "user_id": user_id},
-                ],
+                "$match": {
+                    "user_id": id,
+                    **self.privacy_filter(user_id=user_id, owner_id=id),
+                }
             },
-            sort=[("created_at", DESCENDING)],
-        ).to_list(length=None)
+            {"$sort": dict(self.RECENT_SORT)},
+        ]
 
-        return polls
+        return await self.aggregate_page(
+            collection=self.get_collection("polls"),
+            pipeline=pipeline,
+            skip=skip,
+            limit=limit,
+            actions_user_id=user_id if with_user_actions else None,
+        )
 
-    async def get_by_user_votes(self, id: int, user_id: int) -> list[BSON]:
-        polls: list = await self.polls_db.user_actions.aggregate(
-            [
-                {"$match": {"user_id": id, "has_voted": {"$exists": True}}},
-                {"$project": {"_id": 0, "poll_id": 1, "has_voted": 1}},
-                {"$sort": {"has_voted.voted_at": DESCENDING}},
-                {
-                    "$lookup": {
-                        "from": "polls",
-                        "localField": "poll_id",
-                        "foreignField": "_id",
-                        "as": "poll",
-                    }
-                },
-                {"$unwind": "$poll"},
-                {
-                    "$match": {
-                        "$or": [
-                            {"poll.privacy": "public"},
-                            {"poll.privacy": "private", "poll.user_id": user_id},
-                        ]
-                    }
-                },
-                {"$replaceRoot": {"newRoot": "$poll"}},
-            ]
-        ).to_list(length=None)
+    async def get_by_user_votes(
+        self,
+        id: int,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 0,
+        with_user_actions: bool = False,
+    ) -> tuple[list[BSON], int]:
+        pipeline: list = [
+            {"$match": {"user_id": id, "has_voted": {"$exists": True}}},
+            {"$project": {"_id": 0, "poll_id": 1, "has_voted": 1}},
+            {"$sort": {"has_voted.voted_at": DESCENDING}},
+            {
+                "$lookup": {
+                    "from": "polls",
+                    "localField": "poll_id",
+                    "foreignField": "_id",
+                    "as": "poll",
+                }
+            },
+            {"$unwind": "$poll"},
+            {"$match": self.privacy_filter(user_id=user_id, prefix="poll.")},
+            {"$replaceRoot": {"newRoot": "$poll"}},
+        ]
 
-        return polls
+        return await self.aggregate_page(
+            collection=self.get_collection("user_actions"),
+            pipeline=pipeline,
+            skip=skip,
+            limit=limit,
+            actions_user_id=user_id if with_user_actions else None,
+        )
 
-    async def get_by_user_shares(self, id: int, user_id: int) -> list[BSON]:
-        polls: list = await self.polls_db.user_actions.aggregate(
-            [
-                {"$match": {"user_id": int(id), "has_shared": {"$exists": True}}},
-                {"$project": {"_id": 0, "poll_id": 1, "has_shared": 1}},
-                {"$sort": {"has_shared.shared_at": DESCENDING}},
-                {
-                    "$lookup": {
-                        "from": "polls",
-                        "localField": "poll_id",
-                        "foreignField": "_id",
-                        "as": "poll",
-                    }
-                },
-                {"$unwind": "$poll"},
-                {
-                    "$match": {
-                        "$or": [
-                            {"poll.privacy": "public"},
-                            {"poll.privacy": "private", "poll.user_id": user_id},
-                        ]
-                    }
-                },
-                {"$replaceRoot": {"newRoot": "$poll"}},
-            ]
-        ).to_list(length=None)
+    async def get_by_user_shares(
+        self,
+        id: int,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 0,
+        with_user_actions: bool = False,
+    ) -> tuple[list[BSON], int]:
+        pipeline: list = [
+            {"$match": {"user_id": int(id), "has_shared": {"$exists": True}}},
+            {"$project": {"_id": 0, "poll_id": 1, "has_shared": 1}},
+            {"$sort": {"has_shared.shared_at": DESCENDING}},
+            {
+                "$lookup": {
+                    "from": "polls",
+                    "localField": "poll_id",
+                    "foreignField": "_id",
+                    "as": "poll",
+                }
+            },
+            {"$unwind": "$poll"},
+            {"$match": self.privacy_filter(user_id=user_id, prefix="poll.")},
+            {"$replaceRoot": {"newRoot": "$poll"}},
+        ]
 
-        return polls
+        return await self.aggregate_page(
+            collection=self.get_collection("user_actions"),
+            pipeline=pipeline,
+            skip=skip,
+            limit=limit,
+            actions_user_id=user_id if with_user_actions else None,
+        )
 
-    async def get_by_user_bookmarks(self, id: int, user_id: int) -> list[BSON]:
-        polls: list = await self.polls_db.user_actions.aggregate(
-            [
-                {"$match": {"user_id": int(id), "has_bookmarked": {"$exists": True}}},
-                {"$project": {"_id": 0, "poll_id": 1, "has_bookmarked": 1}},
-                {"$sort": {"has_bookmarked.bookmarked_at": DESCENDING}},
-                {
-                    "$lookup": {
-                        "from": "polls",
-                        "localField": "poll_id",
-                        "foreignField": "_id",
-                        "as": "poll",
-                    }
-                },
-                {"$unwind": "$poll"},
-                {
-                    "$match": {
-                        "$or": [
-                            {"poll.privacy": "public"},
-                            {"poll.privacy": "private", "poll.user_id": user_id},
-                        ]
-                    }
-                },
-                {"$replaceRoot": {"newRoot": "$poll"}},
-            ]
-        ).to_list(length=None)
+    async def get_by_user_bookmarks(
+        self,
+        id: int,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 0,
+        with_user_actions: bool = False,
+    ) -> tuple[list[BSON], int]:
+        pipeline: list = [
+            {"$match": {"user_id": int(id), "has_bookmarked": {"$exists": True}}},
+            {"$project": {"_id": 0, "poll_id": 1, "has_bookmarked": 1}},
+            {"$sort": {"has_bookmarked.bookmarked_at": DESCENDING}},
+            {
+                "$lookup": {
+                    "from": "polls",
+                    "localField": "poll_id",
+                    "foreignField": "_id",
+                    "as": "poll",
+                }
+            },
+            {"$unwind": "$poll"},
+            {"$match": self.privacy_filter(user_id=user_id, prefix="poll.")},
+            {"$replaceRoot": {"newRoot": "$poll"}},
+        ]
 
-        return polls
+        return await self.aggregate_page(
+            collection=self.get_collection("user_actions"),
+            pipeline=pipeline,
+            skip=skip,
+            limit=limit,
+            actions_user_id=user_id if with_user_actions else None,
+        )
 
-    async def get_by_category(self, category: str, user_id: int) -> list[BSON]:
-        polls: list = await self.polls_db.polls.find(
+    async def get_by_category(
+        self,
+        category: str,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 0,
+        with_user_actions: bool = False,
+    ) -> tuple[list[BSON], int]:
+        pipeline: list = [
             {
-                "category": category,
-                "$or": [{"privacy": "public"}, {"privacy": "private", "user_id": user_id}],
+                "$match": {
+                    "category": category,
+                    **self.privacy_filter(user_id=user_id),
+                }
             },
-            sort=[("created_at", DESCENDING)],
-        ).to_list(length=None)
+            {"$sort": dict(self.RECENT_SORT)},
+        ]
 
-        return polls
+        return await self.aggregate_page(
+            collection=self.get_collection("polls"),
+            pipeline=pipeline,
+            skip=skip,
+            limit=limit,
+            actions_user_id=user_id if with_user_actions else None,
+        )
+
+    async def get_by_keyword_after(
+        self,
+        keyword: str,
+        user_id: int,
+        after: list | None = None,
+        limit: int = 0,
+        with_user_actions: bool = False,
+    ) -> list[BSON]:
+        match: dict = {
+            "$text": {"$search": keyword},
+            **self.privacy_filter(user_id=user_id),
+        }
+
+        return await self.find_after(
+            collection=self.get_collection("polls"),
+            match=match,
+            sort=self.POPULAR_SORT,
+            after=after,
+            limit=limit,
+            actions_user_id=user_id if with_user_actions else None,
+        )
+
+    async def get_by_user_id_after(
+        self,
+        id: int,
+        user_id: int,
+        after: list | None = None,
+        limit: int = 0,
+        with_user_actions: bool = False,
+    ) -> list[BSON]:
+        match: dict = {
+            "user_id": id,
+            **self.privacy_filter(user_id=user_id, owner_id=id),
+        }
+
+        return await self.find_after(
+            collection=self.get_collection("polls"),
+            match=match,
+            sort=self.RECENT_SORT,
+            after=after,
+            limit=limit,
+            actions_user_id=user_id if with_user_actions else None,
+        )
+
+    async def get_by_category_after(
+        self,
+        category: str,
+        user_id: int,
+        after: list | None = None,
+        limit: int = 0,
+        with_user_actions: bool = False,
+    ) -> list[BSON]:
+        match: dict = {
+            "category": category,
+            **self.privacy_filter(user_id=user_id),
+        }
+
+        return await self.find_after(
+            collection=self.get_collection("polls"),
+            match=match,
+            sort=self.RECENT_SORT,
+            after=after,
+            limit=limit,
+            actions_user_id=user_id if with_user_actions else None,
+        )
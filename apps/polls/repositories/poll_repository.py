@@ -1,8 +1,14 @@
 from bson import BSON
 from bson.objectid import ObjectId
 
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+
 from rest_framework.exceptions import NotFound
 
+from apps.polls.repositories.projections import (
+    POLL_DETAIL_PROJECTION,
+    POLL_VERSION_PROJECTION,
+)
 from utils.mongo_connection import MongoDBSingleton
 
 
@@ -16,6 +22,13 @@ class PollRepository:
 
     polls_db = MongoDBSingleton().client["polls_db"]
 
+    # Indexes of the 'polls' collection, built by the 'ensure_indexes' command.
+    INDEXES: list = [
+        IndexModel([("title", TEXT), ("description", TEXT), ("category", TEXT)]),
+        IndexModel([("category", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+    ]
+
     async def create(self, data: dict) -> ObjectId | None:
         """
         Creates a new poll.
@@ -25,11 +38,38 @@ class PollRepository:
         id: ObjectId = result.inserted_id
         return id
 
-    async def get_by_id(self, id: str, raise_exception: bool = True) -> BSON | None:
+    async def get_by_id(
+        self, id: str, raise_exception: bool = True, projection: dict = POLL_DETAIL_PROJECTION
+    ) -> BSON | None:
         """
         Retrieves a poll based on its ID.
+
+        Args:
+            id (str): The ID of the poll.
+            raise_exception (bool): Raise 'NotFound' if the poll doesn't exist.
+            projection (dict): The fields to return, one of the named projections of
+                'projections' (detail by default).
         """
-        poll: BSON = await self.polls_db.polls.find_one({"_id": ObjectId(id)})
+        poll: BSON = await self.polls_db.polls.find_one(
+            {"_id": ObjectId(id)}, projection=projection
+        )
+
+        if not poll:
+            if raise_exception:
+                message: str = "Poll not found"
+                raise NotFound(detail={"message": message})
+            return None
+
+        return poll
+
+    async def get_version(self, id: str, raise_exception: bool = True) -> BSON | None:
+        """
+        Retrieves the versions of a poll and the fields needed to check its privacy.
+        """
+        poll: BSON = await self.polls_db.polls.find_one(
+            {"_id": ObjectId(id)},
+            projection=POLL_VERSION_PROJECTION,
+        )
 
         if not poll:
             if raise_exception:
@@ -56,7 +96,7 @@ class PollRepository:
                 # Update poll document in polls collection.
                 await self.polls_db.polls.update_one(
                     {"_id": ObjectId(id)},
-                    {"$set": data},
+                    {"$set": data, "$inc": {"version": 1}},
                     session=session,
                 )
 
@@ -109,7 +149,7 @@ class PollRepository:
         # Add the option in the poll document.
         await self.polls_db.polls.update_one(
             {"_id": ObjectId(id)},
-            {"$push": {"options": option}},
+            {"$push": {"options": option}, "$inc": {"version": 1}},
         )
 
         return ObjectId(id)
@@ -118,7 +158,7 @@ class PollRepository:
         # Remove the option from the poll document.
         await self.polls_db.polls.update_one(
             {"_id": ObjectId(id)},
-            {"$pull": {"options": {"option_text": option}}},
+            {"$pull": {"options": {"option_text": option}}, "$inc": {"version": 1}},
         )
 
         return ObjectId(id)
@@ -0,0 +1,35 @@
+# Named projections of the poll documents, one per read path.
+
+# Poll cards of the feeds: what the card shows, plus the sort keys of the feeds.
+POLL_CARD_PROJECTION: dict = {
+    "title": 1,
+    "description": 1,
+    "privacy": 1,
+    "category": 1,
+    "user_id": 1,
+    "created_at": 1,
+    "options.option_text": 1,
+    "options.votes": 1,
+    "votes_counter": 1,
+    "shares_counter": 1,
+    "bookmarks_counter": 1,
+    "comments_counter": 1,
+    "version": 1,
+}
+
+# Poll detail: the whole document except the heavy fields.
+POLL_DETAIL_PROJECTION: dict = {"voters": 0}
+
+# Permission checks and writes: owner, privacy, options and the fields the writes update
+# elsewhere (comments, category stats).
+POLL_OWNERSHIP_PROJECTION: dict = {
+    "user_id": 1,
+    "privacy": 1,
+    "options": 1,
+    "comments_counter": 1,
+    "category": 1,
+    "votes_counter": 1,
+}
+
+# Conditional GET: the versions and the privacy check.
+POLL_VERSION_PROJECTION: dict = {"user_id": 1, "privacy": 1, "version": 1, "comments_version": 1}
@@ -3,7 +3,7 @@ from datetime import datetime
 from bson import BSON
 from bson.objectid import ObjectId
 
-from pymongo import UpdateOne
+from pymongo import ASCENDING, DESCENDING, IndexModel, UpdateOne
 
 from utils.mongo_connection import MongoDBSingleton
 
@@ -14,10 +14,23 @@ class UserActionsRepository:
 
     This class provides methods to interact with the 'user_actions' collection in the database,
     allowing for the retrieval and storage of user-specific actions such as voting, sharing, and bookmarking.
+
+    Every write of a user actions document increments its 'version', which is part of
+    the ETag of the poll detail.
     """
 
     polls_db = MongoDBSingleton().client["polls_db"]
 
+    # Indexes of the 'user_actions' collection, built by the 'ensure_indexes' command.
+    # There is at most one user actions document per user and poll.
+    INDEXES: list = [
+        IndexModel([("user_id", ASCENDING), ("poll_id", ASCENDING)], unique=True),
+        IndexModel([("user_id", ASCENDING), ("has_voted.voted_at", DESCENDING)]),
+        IndexModel([("user_id", ASCENDING), ("has_shared.shared_at", DESCENDING)]),
+        IndexModel([("user_id", ASCENDING), ("has_bookmarked.bookmarked_at", DESCENDING)]),
+        IndexModel([("poll_id", ASCENDING)]),
+    ]
+
     async def get_user_actions(self, id: str, user_id: int, projection: dict = {"_id": 1}):
         """
         Retrieves user-specific actions related to a poll.
@@ -34,6 +47,31 @@ class UserActionsRepository:
 
         return user_actions or None
 
+    async def get_user_actions_for_polls(
+        self, user_id: int, poll_ids: list[ObjectId], projection: dict = {"_id": 1}
+    ):
+        """
+        Retrieves the user-specific actions of several polls in a single query.
+
+        Args:
+            user_id (int): The ID of the user for whom to retrieve actions.
+            poll_ids (list[ObjectId]): The IDs of the polls.
+
+        Returns:
+            dict: A dictionary mapping each poll ID to the user actions document (without
+            'poll_id'). Polls without actions are not included.
+        """
+
+        if not poll_ids:
+            return {}
+
+        user_actions: list[BSON] = await self.polls_db.user_actions.find(
+            {"user_id": user_id, "poll_id": {"$in": list(poll_ids)}},
+            projection={**projection, "poll_id": 1},
+        ).to_list(length=None)
+
+        return {actions.pop("poll_id"): actions for actions in user_actions}
+
     async def create(self, id: str, user_id: int):
         await self.polls_db.user_actions.insert_one(
             {"poll_id": ObjectId(id), "user_id": user_id},
@@ -47,17 +85,20 @@ class UserActionsRepository:
                 # Update vote action if user actions document exist.
                 await self.polls_db.user_actions.update_one(
                     {"user_id": user_id, "poll_id": ObjectId(id)},
-                    {"$set": {"has_voted": {"vote": vote, "voted_at": datetime.now()}}},
+                    {
+                        "$set": {"has_voted": {"vote": vote, "voted_at": datetime.now()}},
+                        "$inc": {"version": 1},
+                    },
                     upsert=True,
                     session=session,
                 )
 
                 await self.polls_db.polls.bulk_write(
                     [
-                        # Add user ID to voters list in the poll document.
+                        # Add count to votes counter in the poll document.
                         UpdateOne(
                             {"_id": ObjectId(id)},
-                            {"$push": {"voters": user_id}, "$inc": {"votes_counter": 1}},
+                            {"$inc": {"votes_counter": 1, "version": 1}},
                         ),
                         # Add count to voted counter in the poll document.
                         UpdateOne(
@@ -77,7 +118,10 @@ class UserActionsRepository:
             async with session.start_transaction():
                 await self.polls_db.user_actions.update_one(
                     {"user_id": user_id, "poll_id": ObjectId(id)},
-                    {"$set": {"has_voted": {"vote": vote, "voted_at": datetime.now()}}},
+                    {
+                        "$set": {"has_voted": {"vote": vote, "voted_at": datetime.now()}},
+                        "$inc": {"version": 1},
+                    },
                     session=session,
                 )
 
@@ -93,6 +137,8 @@ class UserActionsRepository:
                             {"_id": ObjectId(id), "options.option_text": vote},
                             {"$inc": {"options.$.votes": 1}},
                         ),
+                        # The version changes even if an option filter misses.
+                        UpdateOne({"_id": ObjectId(id)}, {"$inc": {"version": 1}}),
                     ],
                     session=session,
                 )
@@ -107,16 +153,16 @@ class UserActionsRepository:
                 # Remove vote action if user actions document exist.
                 await self.polls_db.user_actions.update_one(
                     {"user_id": user_id, "poll_id": ObjectId(id)},
-                    {"$unset": {"has_voted": ""}},
+                    {"$unset": {"has_voted": ""}, "$inc": {"version": 1}},
                     session=session,
                 )
 
                 await self.polls_db.polls.bulk_write(
                     [
-                        # Remove user ID to voters list in the poll document.
+                        # Remove count from votes counter in the poll document.
                         UpdateOne(
                             {"_id": ObjectId(id)},
-                            {"$pull": {"voters": user_id}, "$inc": {"votes_counter": -1}},
+                            {"$inc": {"votes_counter": -1, "version": 1}},
                         ),
                         # Remove the previous vote in poll document.
                         UpdateOne(
@@ -137,7 +183,7 @@ class UserActionsRepository:
                 # Update share action if user actions document exist.
                 await self.polls_db.user_actions.update_one(
                     {"user_id": user_id, "poll_id": ObjectId(id)},
-                    {"$set": {"has_shared": {"shared_at": datetime.now()}}},
+                    {"$set": {"has_shared": {"shared_at": datetime.now()}}, "$inc": {"version": 1}},
                     upsert=True,
                     session=session,
                 )
@@ -145,7 +191,7 @@ class UserActionsRepository:
                 # Add count to shared counter in the poll document.
                 await self.polls_db.polls.update_one(
                     {"_id": ObjectId(id)},
-                    {"$inc": {"shares_counter": 1}},
+                    {"$inc": {"shares_counter": 1, "version": 1}},
                     session=session,
                 )
 
@@ -159,14 +205,14 @@ class UserActionsRepository:
                 # Remove share action if user actions document exist.
                 await self.polls_db.user_actions.update_one(
                     {"user_id": user_id, "poll_id": ObjectId(id)},
-                    {"$unset": {"has_shared": ""}},
+                    {"$unset": {"has_shared": ""}, "$inc": {"version": 1}},
                     session=session,
                 )
 
                 # Remove count to shared counter in the poll document.
                 await self.polls_db.polls.update_one(
                     {"_id": ObjectId(id)},
-                    {"$inc": {"shares_counter": -1}},
+                    {"$inc": {"shares_counter": -1, "version": 1}},
                     session=session,
                 )
 
@@ -180,7 +226,7 @@ class UserActionsRepository:
                 # Update bookmark action if user actions document exist.
                 await self.polls_db.user_actions.update_one(
                     {"user_id": user_id, "poll_id": ObjectId(id)},
-                    {"$set": {"has_bookmarked": {"bookmarked_at": datetime.now()}}},
+                    {"$set": {"has_bookmarked": {"bookmarked_at": datetime.now()}}, "$inc": {"version": 1}},
                     upsert=True,
                     session=session,
                 )
@@ -188,7 +234,7 @@ class UserActionsRepository:
                 # Add count to bookmarked counter in the poll document.
                 await self.polls_db.polls.update_one(
                     {"_id": ObjectId(id)},
-                    {"$inc": {"bookmarks_counter": 1}},
+                    {"$inc": {"bookmarks_counter": 1, "version": 1}},
                     session=session,
                 )
 
@@ -202,34 +248,17 @@ class UserActionsRepository:
                 # Remove bookmark action if user actions document exist.
                 await self.polls_db.user_actions.update_one(
                     {"user_id": user_id, "poll_id": ObjectId(id)},
-                    {"$unset": {"has_bookmarked": ""}},
+                    {"$unset": {"has_bookmarked": ""}, "$inc": {"version": 1}},
                     session=session,
                 )
 
                 # Remove count to bookmarked counter in the poll document.
                 await self.polls_db.polls.update_one(
                     {"_id": ObjectId(id)},
-                    {"$inc": {"bookmarks_counter": -1}},
+                    {"$inc": {"bookmarks_counter": -1, "version": 1}},
                     session=session,
                 )
 
                 await session.commit_transaction()
             await session.end_session()
         return ObjectId(id)
-
-    ## ??????????
-
-    async def get_user_id_list(self):
-        poll_id_list: list[BSON] = await self.polls_db.user_actions.find(
-            {},
-            {"_id": 0, "poll_id": 1},
-        ).to_list(None)
-
-        user_id_list: list[BSON] = await self.polls_db.user_actions.aggregate(
-            [
-                {"$match": {"poll_id": {"$in": [x["poll_id"] for x in poll_id_list]}}},
-                {"$group": {"_id": "$user_id"}},
-            ]
-        ).to_list(None)
-
-        return user_id_list
@@ -0,0 +1,217 @@
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+
+from bson.objectid import ObjectId
+
+from django.conf import settings
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError, ServerSelectionTimeoutError
+
+from apps.polls.repositories.atomic_vote_repository import AtomicVoteRepository
+from apps.polls.utils.poll_cache import PollCache
+from utils.mongo_connection import MongoDBSingleton
+
+logger = logging.getLogger(__name__)
+
+
+class VoteCounterBuffer:
+    """
+    Write-behind buffer for the vote counters of the poll documents.
+
+    Counter deltas are coalesced in memory per poll and option, and written with a single
+    'bulk_write' (one update per poll) every 'interval' seconds.
+
+    The flusher runs on an event loop owned by the buffer, in a daemon thread started on
+    the first delta. It doesn't depend on the loop of the request that added the delta,
+    which may be short-lived (each async view runs in its own loop under WSGI). The
+    deltas can be added from any thread.
+
+    Pending deltas are written by 'stop' (ASGI lifespan shutdown). They are lost if the
+    process exits without it (under WSGI, the deltas of the last interval), the counters
+    can then be rebuilt from 'user_actions' with the 'rebuild_vote_counters' command.
+
+    Args:
+        interval (float): The number of seconds between flushes.
+    """
+
+    polls_db = MongoDBSingleton().client["polls_db"]
+    poll_cache = PollCache()
+
+    def __init__(self, interval: float = 1.0):
+        self.interval = interval
+        self.deltas: dict = {}
+        self.lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def add(self, id: str | ObjectId, votes: int = 0, options: dict | None = None):
+        """
+        Adds counter deltas for a poll.
+
+        Args:
+            id (str): The ID of the poll.
+            votes (int): The delta of 'votes_counter'.
+            options (dict): The deltas of the option votes, keyed by option text.
+        """
+        self.merge(deltas={id: {"votes_counter": votes, "options": options or {}}})
+        self.start()
+
+    def merge(self, deltas: dict):
+        """
+        Adds the counter deltas of several polls, without starting the flusher.
+        """
+        with self.lock:
+            for id, added in deltas.items():
+                counters: dict = self.deltas.setdefault(
+                    ObjectId(id), {"votes_counter": 0, "options": defaultdict(int)}
+                )
+                counters["votes_counter"] += added["votes_counter"]
+                for option, delta in added["options"].items():
+                    counters["options"][option] += delta
+
+    def start(self):
+        """
+        Starts the flusher thread and its event loop, if they are not running.
+        """
+        with self.lock:
+            if self._loop is not None:
+                return
+
+            self._loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=self.run_loop, args=(self._loop,), name="vote-counter-buffer"
+            )
+            thread.daemon = True
+            thread.start()
+
+    def run_loop(self, loop: asyncio.AbstractEventLoop):
+        # The flusher is created in the thread, so it doesn't inherit the context of the
+        # request that started it (asgiref executors, 'request_command_stats').
+        asyncio.set_event_loop(loop)
+        loop.create_task(self.run())
+        loop.run_forever()
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    async def close(self):
+        """
+        Cancels the flusher and writes the pending deltas, runs in the flusher loop.
+        """
+        for task in asyncio.all_tasks():
+            if task is not asyncio.current_task():
+                task.cancel()
+
+        await self.flush()
+        MongoDBSingleton().close_client()
+
+    async def stop(self):
+        """
+        Writes the pending deltas before the process exits (ASGI lifespan shutdown) and
+        stops the flusher thread.
+
+        The deltas that can't be written within two intervals are lost (see
+        'rebuild_vote_counters').
+        """
+        with self.lock:
+            loop, self._loop = self._loop, None
+
+        if loop is None:
+            return
+
+        future = asyncio.run_coroutine_threadsafe(self.close(), loop)
+        try:
+            await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.interval * 2)
+        except TimeoutError:
+            logger.error("Vote counters of %s polls not flushed at shutdown.", len(self.deltas))
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+
+    def get_requests(self, deltas: dict):
+        """
+        Builds one update per poll, returns the poll IDs and the updates in the same order.
+        """
+        ids: list = []
+        requests: list = []
+        for poll_id, counters in deltas.items():
+            inc: dict = {}
+            array_filters: list = []
+
+            if counters["votes_counter"]:
+                inc["votes_counter"] = counters["votes_counter"]
+
+            for index, (option, delta) in enumerate(counters["options"].items()):
+                if delta:
+                    inc[f"options.$[o{index}].votes"] = delta
+                    array_filters.append({f"o{index}.option_text": option})
+
+            if inc:
+                inc["version"] = 1
+                ids.append(poll_id)
+                requests.append(
+                    UpdateOne({"_id": poll_id}, {"$inc": inc}, array_filters=array_filters or None)
+                )
+
+        return ids, requests
+
+    async def flush(self):
+        """
+        Writes the pending deltas to the poll documents.
+        """
+        with self.lock:
+            deltas, self.deltas = self.deltas, {}
+        ids, requests = self.get_requests(deltas=deltas)
+
+        if not requests:
+            return
+
+        try:
+            await self.polls_db.polls.bulk_write(requests, ordered=False)
+
+        except BulkWriteError as error:
+            # Keep the failed updates for the next flush.
+            failed: set = {ids[e["index"]] for e in error.details["writeErrors"]}
+            self.requeue(deltas={id: deltas[id] for id in failed})
+            logger.warning("Vote counters flush failed for %s polls: %s", len(failed), error)
+
+        except ServerSelectionTimeoutError as error:
+            # Nothing was written.
+            self.requeue(deltas=deltas)
+            logger.warning("Vote counters flush failed: %s", error)
+
+        except PyMongoError:
+            # The write may or may not have been applied, requeueing could count the
+            # votes twice: the counters of these polls must be rebuilt.
+            logger.exception(
+                "Vote counters flush failed, run 'rebuild_vote_counters' for the polls %s.",
+                ", ".join(str(id) for id in ids),
+            )
+
+        for id in deltas:
+            await self.poll_cache.invalidate(id=id)
+
+    def requeue(self, deltas: dict):
+        # The flusher is running (or stopping), it writes them with the next flush.
+        self.merge(deltas=deltas)
+
+
+class BufferedVoteRepository(AtomicVoteRepository):
+    """
+    Vote engine that writes the user vote durably in 'user_actions' (see
+    'AtomicVoteRepository') and buffers the poll counter updates in a 'VoteCounterBuffer'.
+    """
+
+    buffer = VoteCounterBuffer(interval=getattr(settings, "POLL_VOTE_BUFFER_INTERVAL", 1.0))
+
+    async def count_vote(self, id: str, user_id: int, vote: str):
+        self.buffer.add(id=id, votes=1, options={vote: 1})
+
+    async def move_vote(self, id: str, user_id: int, vote: str, del_vote: str):
+        self.buffer.add(id=id, options={del_vote: -1, vote: 1})
+
+    async def uncount_vote(self, id: str, user_id: int, del_vote: str):
+        self.buffer.add(id=id, votes=-1, options={del_vote: -1})
@@ -12,12 +12,15 @@ class PollSerializer(serializers.Serializer):
         validated_data["user_id"] = self.context["user_id"]
         validated_data["created_at"] = datetime.now()
 
-        validated_data["voters"] = []
         validated_data["votes_counter"] = 0
         validated_data["shares_counter"] = 0
         validated_data["bookmarks_counter"] = 0
         validated_data["comments_counter"] = 0
 
+        # Bumped by every write of the poll and of its comments (ETags).
+        validated_data["version"] = 1
+        validated_data["comments_version"] = 1
+
         return validated_data
 
     def validate_privacy(self, value):
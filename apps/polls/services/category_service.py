@@ -0,0 +1,26 @@
+from apps.polls.repositories.category_stats_repository import CategoryStatsRepository
+from apps.polls.utils.categorys import CATEGORIES
+
+
+class CategoryService:
+    stats_repository = CategoryStatsRepository()
+
+    async def get_categories_data(self):
+        """
+        Returns the categories with their number of polls and votes.
+        """
+        stats: dict = await self.stats_repository.get_all()
+
+        data: list[dict] = []
+        for category in CATEGORIES["list"]:
+            category_stats: dict = stats.get(category["value"], {})
+            data.append(
+                {
+                    "text": category["text"],
+                    "value": category["value"],
+                    "total_polls": category_stats.get("total_polls", 0),
+                    "total_votes": category_stats.get("total_votes", 0),
+                }
+            )
+
+        return data
@@ -4,8 +4,11 @@ from bson.objectid import ObjectId
 from apps.polls.repositories.poll_comment_list_repository import PollCommentListRepository
 from apps.polls.repositories.poll_repository import PollRepository
 from apps.polls.utils.poll_comment_utils import PollCommentUtils
+from apps.polls.utils.json_converter import poll_comment_to_json
 from apps.accounts.services.user_profile_service import UserProfileService
 
+from utils.concurrency import run_concurrently
+from utils.etag import ETag
 from utils.pagination import Pagination
 
 
@@ -15,13 +18,18 @@ class PollCommentListService:
     utils = PollCommentUtils()
     pagination = Pagination()
     poll_repository = PollRepository()
+    etag = ETag()
+
+    async def filter_poll_comment_list(self, comments: list[BSON], owners: dict | None = None):
+        if owners is None:
+            owners: dict = await self.user_profile_service.a_get_owners(
+                user_ids=[comment["user_id"] for comment in comments]
+            )
 
-    async def filter_poll_comment_list(self, comments: list[dict]):
         items: list[dict] = []
         for comment in comments:
-            comment: dict = await self.utils.simplify_poll_comment_data(comment=comment)
-            profile: dict = await self.user_profile_service.a_get_owner(user_id=comment["user_id"])
-            comment["user_profile"] = profile
+            comment: dict = poll_comment_to_json(comment=comment)
+            comment["user_profile"] = owners.get(comment["user_id"])
 
             item: dict = {}
             item["comment"] = comment
@@ -29,19 +37,59 @@ class PollCommentListService:
 
         return items
 
-    async def get_by_poll_id(self, poll_id: str, page: int, page_size: int, user_id: int):
+    def make_etag(self, poll_id: str, poll: BSON, owners: dict) -> str:
+        """
+        Builds the ETag of the comment list of a poll from the 'comments_version' of the
+        poll (it changes with every comment write) and the owner cards of the authors,
+        keyed by user ID.
+        """
+        return self.etag.make_weak(
+            "comments",
+            poll_id,
+            poll.get("comments_version", 0),
+            sorted((user_id, sorted(owner.items())) for user_id, owner in owners.items()),
+        )
+
+    async def get_etag(self, poll_id: str, user_id: int | None = None) -> str:
+        """
+        Returns the ETag of the comment list of a poll, without loading the comments.
+
+        Only the authors of the comments are read, for their owner cards.
+        """
         await self.utils.validate_id(id=poll_id)
-        poll: BSON = await self.poll_repository.get_by_id(id=poll_id)
+
+        poll, user_ids = await run_concurrently(
+            self.poll_repository.get_version(id=poll_id),
+            self.repository.get_user_ids(id=poll_id),
+        )
         await self.utils.check_poll_privacy(poll=poll, user_id=user_id)
 
-        comments: list[BSON] = await self.repository.get_by_poll_id(id=poll_id)
-        comments: list[dict] = await self.utils.bson_to_json(bson=comments)
+        owners: dict = await self.user_profile_service.a_get_owners(user_ids=user_ids)
+
+        return self.make_etag(poll_id=poll_id, poll=poll, owners=owners)
 
-        data: dict = await self.pagination.a_paginate(
-            object_list=comments, page=page, page_size=page_size
+    async def get_by_poll_id(self, poll_id: str, page: int, page_size: int, user_id: int):
+        """
+        Returns a page of the comments of a poll and the ETag of the comment list (the
+        same as 'get_etag', built from the loaded comments).
+        """
+        await self.utils.validate_id(id=poll_id)
+
+        # The comments are only returned once the privacy check has passed.
+        poll, comments = await run_concurrently(
+            self.poll_repository.get_version(id=poll_id),
+            self.repository.get_by_poll_id(id=poll_id),
         )
+        await self.utils.check_poll_privacy(poll=poll, user_id=user_id)
+
+        owners: dict = await self.user_profile_service.a_get_owners(
+            user_ids=[comment["user_id"] for comment in comments]
+        )
+
+        # The comments are already in memory, slicing them doesn't need a thread.
+        data: dict = self.pagination.paginate(object_list=comments, page=page, page_size=page_size)
 
-        items = await self.filter_poll_comment_list(comments=data["items"])
+        items = await self.filter_poll_comment_list(comments=data["items"], owners=owners)
         data["items"] = items
 
-        return data
+        return data, self.make_etag(poll_id=poll_id, poll=poll, owners=owners)
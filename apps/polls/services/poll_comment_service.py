@@ -1,20 +1,28 @@
 from bson import BSON
 from bson.objectid import ObjectId
 
+from rest_framework.exceptions import NotFound
+
 from apps.polls.repositories.poll_comment_repository import PollCommentRepository
 from apps.polls.repositories.poll_repository import PollRepository
+from apps.polls.repositories.projections import POLL_OWNERSHIP_PROJECTION
 from apps.polls.utils.poll_comment_utils import PollCommentUtils
+from apps.polls.utils.poll_cache import PollCache
 from apps.polls.serializers.poll_comment_serializer import PollCommentSerializer
+from utils.concurrency import run_concurrently
 
 
 class PollCommentService:
     repository = PollCommentRepository()
     poll_repository = PollRepository()
     utils = PollCommentUtils()
+    poll_cache = PollCache()
 
     async def create(self, poll_id: str, user_id: int, data: dict):
         await self.utils.validate_id(id=poll_id)
-        poll: BSON = await self.poll_repository.get_by_id(id=poll_id)
+        poll: BSON = await self.poll_repository.get_by_id(
+            id=poll_id, projection=POLL_OWNERSHIP_PROJECTION
+        )
         await self.utils.check_poll_privacy(user_id=user_id, poll=poll)
 
         serializer = PollCommentSerializer(data=data, partial=True)
@@ -24,35 +32,57 @@ class PollCommentService:
         object_id: ObjectId = await self.repository.create(
             poll_id=poll_id, user_id=user_id, comment=comment
         )
+        # The comments counter of the poll has changed.
+        await self.poll_cache.invalidate(id=poll_id)
 
         return object_id, ObjectId(poll_id)
 
     async def update(self, id: str, poll_id: str, user_id: int, data: dict):
         await self.utils.validate_id(id=poll_id)
-        poll: BSON = await self.poll_repository.get_by_id(id=poll_id)
+        await self.utils.validate_id(id=id)
+
+        # A missing comment is only reported once the privacy check has passed.
+        poll, comment = await run_concurrently(
+            self.poll_repository.get_by_id(id=poll_id, projection=POLL_OWNERSHIP_PROJECTION),
+            self.repository.get_by_id(id=id, raise_exception=False),
+        )
         await self.utils.check_poll_privacy(user_id=user_id, poll=poll)
 
-        await self.utils.validate_id(id=id)
-        comment: BSON = await self.repository.get_by_id(id=id)
+        if not comment:
+            message: str = "Comment not found"
+            raise NotFound(detail={"message": message})
+
         await self.utils.is_owner(object=comment, user_id=user_id)
 
         serializer = PollCommentSerializer(data=data, partial=True)
         serializer.is_valid(raise_exception=True)
         comment: str = serializer.validated_data.get("comment")
 
-        object_id: ObjectId = await self.repository.update(id=id, comment=comment)
+        object_id: ObjectId = await self.repository.update(
+            id=id, poll_id=poll_id, comment=comment
+        )
 
         return object_id, ObjectId(poll_id)
 
     async def delete(self, id: str, poll_id: str, user_id: int):
         await self.utils.validate_id(id=poll_id)
-        poll: BSON = await self.poll_repository.get_by_id(id=poll_id)
+        await self.utils.validate_id(id=id)
+
+        # A missing comment is only reported once the privacy check has passed.
+        poll, comment = await run_concurrently(
+            self.poll_repository.get_by_id(id=poll_id, projection=POLL_OWNERSHIP_PROJECTION),
+            self.repository.get_by_id(id=id, raise_exception=False),
+        )
         await self.utils.check_poll_privacy(user_id=user_id, poll=poll)
 
-        await self.utils.validate_id(id=id)
-        comment: BSON = await self.repository.get_by_id(id=id)
+        if not comment:
+            message: str = "Comment not found"
+            raise NotFound(detail={"message": message})
+
         await self.utils.is_owner(object=comment, user_id=user_id)
 
         object_id: ObjectId = await self.repository.delete(id=id, poll_id=poll_id)
+        # The comments counter of the poll has changed.
+        await self.poll_cache.invalidate(id=poll_id)
 
         return object_id, ObjectId(poll_id)
@@ -1,9 +1,11 @@
 from bson import BSON
-from bson.objectid import ObjectId
+
+from django.conf import settings
 
 from apps.polls.repositories.poll_list_repository import PollListRepository
 from apps.polls.repositories.user_actions_repository import UserActionsRepository
 from apps.polls.utils.poll_utils import PollUtils
+from apps.polls.utils.json_converter import poll_to_json, user_actions_to_json
 from apps.accounts.services.user_profile_service import UserProfileService
 
 from utils.pagination import Pagination
@@ -16,23 +18,46 @@ class PollListService:
     utils = PollUtils()
     pagination = Pagination()
 
-    async def filter_poll_list(self, polls: list[dict], user_id: int | None = None):
+    def use_user_actions_lookup(self, feed: str, user_id: int | None = None):
+        """
+        Tells whether a feed joins the viewer's user actions in its own aggregation.
+
+        Feeds listed in the 'POLL_FEEDS_USER_ACTIONS_LOOKUP' setting use the '$lookup'
+        path, the others load the user actions with a separate batched query.
+        """
+        feeds: list = getattr(settings, "POLL_FEEDS_USER_ACTIONS_LOOKUP", [])
+        return bool(user_id) and feed in feeds
+
+    async def filter_poll_list(
+        self, polls: list[BSON], user_id: int | None = None, joined_user_actions: bool = False
+    ):
+        owners: dict = await self.user_profile_service.a_get_owners(
+            user_ids=[poll["user_id"] for poll in polls]
+        )
+
+        user_actions_by_poll: dict = {}
+        if user_id and not joined_user_actions:
+            projection: dict = {"_id": 0, "has_voted": 1, "has_shared": 1, "has_bookmarked": 1}
+            user_actions_by_poll = await self.user_actions_repository.get_user_actions_for_polls(
+                user_id=user_id,
+                poll_ids=[poll["_id"] for poll in polls],
+                projection=projection,
+            )
+
         items: list[dict] = []
         for poll in polls:
-            poll: dict = await self.utils.simplify_poll_data(poll=poll)
-            profile: dict = await self.user_profile_service.a_get_owner(user_id=poll["user_id"])
-            poll["user_profile"] = profile
+            # The polls may be read-only ('POLL_LIST_RAW_BSON').
+            joined: list[BSON] = poll.get("authenticated_user_actions", [])
+            result: BSON = user_actions_by_poll.get(poll["_id"])
+            poll: dict = poll_to_json(poll=poll, exclude=("authenticated_user_actions",))
+            poll["user_profile"] = owners.get(poll["user_id"])
 
             user_actions: dict = {}
-            if user_id:
-                projection: dict = {"_id": 0, "has_voted": 1, "has_shared": 1, "has_bookmarked": 1}
-                result: BSON = await self.user_actions_repository.get_user_actions(
-                    id=ObjectId(poll["id"]), user_id=user_id, projection=projection
-                )
+            if joined_user_actions:
+                user_actions = user_actions_to_json(user_actions=joined[0]) if joined else {}
 
-                if result != None:
-                    result: dict = await self.utils.bson_to_json(bson=result)
-                    user_actions = result
+            elif result != None:
+                user_actions = user_actions_to_json(user_actions=result)
 
             item: dict = {}
             item["poll"] = poll
@@ -41,92 +66,183 @@ class PollListService:
 
         return items
 
-    async def get_by_keyword(
-        self, keyword: str, page: int, page_size: int, user_id: int | None = None
+    async def paginate_by_cursor(
+        self,
+        polls: list[BSON],
+        cursor: str,
+        page_size: int,
+        sort: list,
+        user_id: int | None = None,
+        joined_user_actions: bool = False,
     ):
-        polls: list[BSON] = await self.repository.get_by_keyword(keyword=keyword, user_id=user_id)
-        polls: list[dict] = await self.utils.bson_to_json(bson=polls)
-
-        data: dict = await self.pagination.a_paginate(
-            object_list=polls, page=page, page_size=page_size
+        """
+        Builds a cursor-paginated response from polls fetched with a limit of 'page_size + 1'.
+        """
+        keys: list[str] = [field for field, _ in sort]
+        data: dict = self.pagination.paginate_cursor(
+            items=polls, page_size=page_size, keys=keys, cursor=cursor
         )
 
-        items = await self.filter_poll_list(polls=data["items"], user_id=user_id)
+        items = await self.filter_poll_list(
+            polls=data["items"], user_id=user_id, joined_user_actions=joined_user_actions
+        )
         data["items"] = items
 
         return data
 
-    async def get_by_user_id(self, id: int, page: int, page_size: int, user_id: int | None = None):
-        polls: list[BSON] = await self.repository.get_by_user_id(id=id, user_id=user_id)
-        polls: list[dict] = await self.utils.bson_to_json(bson=polls)
-
-        data: dict = await self.pagination.a_paginate(
-            object_list=polls, page=page, page_size=page_size
+    async def get_feed(
+        self,
+        feed: str,
+        get_page,
+        page: int,
+        page_size: int,
+        user_id: int | None = None,
+        cursor: str | None = None,
+        get_after=None,
+        sort: list | None = None,
+        **filters,
+    ):
+        """
+        Loads a page of the poll feed 'feed'.
+
+        'get_page' is the repository method of the numbered pages, called with 'filters'.
+        Feeds with cursor pagination also pass the repository method 'get_after' and the
+        'sort' it pages by, these are used when a 'cursor' is given.
+        """
+        with_user_actions: bool = self.use_user_actions_lookup(feed=feed, user_id=user_id)
+
+        if cursor is not None and get_after is not None:
+            after: list = self.pagination.decode_cursor(
+                cursor=cursor, types=self.repository.get_key_types(sort=sort)
+            )
+            polls: list[BSON] = await get_after(
+                **filters,
+                user_id=user_id,
+                after=after,
+                limit=page_size + 1,
+                with_user_actions=with_user_actions,
+            )
+
+            return await self.paginate_by_cursor(
+                polls=polls,
+                cursor=cursor,
+                page_size=page_size,
+                sort=sort,
+                user_id=user_id,
+                joined_user_actions=with_user_actions,
+            )
+
+        skip, limit = self.pagination.get_skip_limit(page=page, page_size=page_size)
+        polls, total_items = await get_page(
+            **filters,
+            user_id=user_id,
+            skip=skip,
+            limit=limit,
+            with_user_actions=with_user_actions,
+        )
+        data: dict = self.pagination.paginate_page(
+            items=polls, total_items=total_items, page=page, page_size=page_size
         )
 
-        items = await self.filter_poll_list(polls=data["items"], user_id=user_id)
+        items = await self.filter_poll_list(
+            polls=data["items"], user_id=user_id, joined_user_actions=with_user_actions
+        )
         data["items"] = items
 
         return data
 
-    async def get_by_user_votes(
-        self, id: int, page: int, page_size: int, user_id: int | None = None
+    async def get_by_keyword(
+        self,
+        keyword: str,
+        page: int,
+        page_size: int,
+        user_id: int | None = None,
+        cursor: str | None = None,
     ):
-        polls: list[BSON] = await self.repository.get_by_user_votes(id=id, user_id=user_id)
-        polls: list[dict] = await self.utils.bson_to_json(bson=polls)
-
-        data: dict = await self.pagination.a_paginate(
-            object_list=polls, page=page, page_size=page_size
+        return await self.get_feed(
+            feed="keyword",
+            get_page=self.repository.get_by_keyword,
+            get_after=self.repository.get_by_keyword_after,
+            sort=self.repository.POPULAR_SORT,
+            page=page,
+            page_size=page_size,
+            user_id=user_id,
+            cursor=cursor,
+            keyword=keyword,
         )
 
-        items = await self.filter_poll_list(polls=data["items"], user_id=user_id)
-        data["items"] = items
+    async def get_by_user_id(
+        self,
+        id: int,
+        page: int,
+        page_size: int,
+        user_id: int | None = None,
+        cursor: str | None = None,
+    ):
+        return await self.get_feed(
+            feed="user",
+            get_page=self.repository.get_by_user_id,
+            get_after=self.repository.get_by_user_id_after,
+            sort=self.repository.RECENT_SORT,
+            page=page,
+            page_size=page_size,
+            user_id=user_id,
+            cursor=cursor,
+            id=id,
+        )
 
-        return data
+    async def get_by_user_votes(
+        self, id: int, page: int, page_size: int, user_id: int | None = None
+    ):
+        return await self.get_feed(
+            feed="user_votes",
+            get_page=self.repository.get_by_user_votes,
+            page=page,
+            page_size=page_size,
+            user_id=user_id,
+            id=id,
+        )
 
     async def get_by_user_shares(
         self, id: int, page: int, page_size: int, user_id: int | None = None
     ):
-        polls: list[BSON] = await self.repository.get_by_user_shares(id=id, user_id=user_id)
-        polls: list[dict] = await self.utils.bson_to_json(bson=polls)
-
-        data: dict = await self.pagination.a_paginate(
-            object_list=polls, page=page, page_size=page_size
+        return await self.get_feed(
+            feed="user_shares",
+            get_page=self.repository.get_by_user_shares,
+            page=page,
+            page_size=page_size,
+            user_id=user_id,
+            id=id,
         )
 
-        items = await self.filter_poll_list(polls=data["items"], user_id=user_id)
-        data["items"] = items
-
-        return data
-
     async def get_by_user_bookmarks(
         self, id: int, page: int, page_size: int, user_id: int | None = None
     ):
-        polls: list[BSON] = await self.repository.get_by_user_bookmarks(id=id, user_id=user_id)
-        polls: list[dict] = await self.utils.bson_to_json(bson=polls)
-
-        data: dict = await self.pagination.a_paginate(
-            object_list=polls, page=page, page_size=page_size
+        return await self.get_feed(
+            feed="user_bookmarks",
+            get_page=self.repository.get_by_user_bookmarks,
+            page=page,
+            page_size=page_size,
+            user_id=user_id,
+            id=id,
         )
 
-        items = await self.filter_poll_list(polls=data["items"], user_id=user_id)
-        data["items"] = items
-
-        return data
-
     async def get_by_category(
-        self, category: str, page: int, page_size: int, user_id: int | None = None
+        self,
+        category: str,
+        page: int,
+        page_size: int,
+        user_id: int | None = None,
+        cursor: str | None = None,
     ):
-        polls: list[BSON] = await self.repository.get_by_category(
-            category=category, user_id=user_id
-        )
-        polls: list[dict] = await self.utils.bson_to_json(bson=polls)
-
-        data: dict = await self.pagination.a_paginate(
-            object_list=polls, page=page, page_size=page_size
+        return await self.get_feed(
+            feed="category",
+            get_page=self.repository.get_by_category,
+            get_after=self.repository.get_by_category_after,
+            sort=self.repository.RECENT_SORT,
+            page=page,
+            page_size=page_size,
+            user_id=user_id,
+            cursor=cursor,
+            category=category,
         )
-
-        items = await self.filter_poll_list(polls=data["items"], user_id=user_id)
-        data["items"] = items
-
-        return data
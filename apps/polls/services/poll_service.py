@@ -8,9 +8,15 @@ from apps.polls.serializers.poll_serializers import (
     OptionSerializer,
 )
 from apps.polls.repositories.poll_repository import PollRepository
+from apps.polls.repositories.projections import POLL_OWNERSHIP_PROJECTION
+from apps.polls.repositories.category_stats_repository import CategoryStatsRepository
 from apps.polls.utils.poll_utils import PollUtils
 from apps.polls.utils.poll_option_utils import PollOptionUtils
+from apps.polls.utils.poll_cache import PollCache
+from apps.polls.utils.json_converter import poll_to_json, user_actions_to_json
 from apps.accounts.services.user_profile_service import UserProfileService
+from utils.concurrency import run_concurrently
+from utils.etag import ETag
 
 
 class PollService:
@@ -27,6 +33,9 @@ class PollService:
     option_utils = PollOptionUtils()
     user_actions_repository = UserActionsRepository()
     user_profile_service = UserProfileService()
+    category_stats_repository = CategoryStatsRepository()
+    cache = PollCache()
+    etag = ETag()
 
     async def create(self, data: dict, user_id: int):
         """
@@ -52,38 +61,121 @@ class PollService:
         poll: dict = poll_serializer.save()
 
         object_id: ObjectId = await self.repository.create(data=poll)
+        await self.category_stats_repository.increment(category=poll["category"], polls=1)
+
         return object_id
 
-    async def get_by_id(self, id: str, user_id: int | None = None):
+    async def get_state(self, id: str, user_id: int | None = None):
+        """
+        Reads what the poll detail of a viewer and its ETag depend on, and checks the
+        privacy.
+
+        The live versions of the poll ('get_version'), the viewer's user actions and the
+        cached poll are read concurrently, then the owner card ('a_get_owner', an LRU hit
+        in general). The privacy is checked against the live versions, not the cache.
+        The state is passed to 'get_etag' and 'get_by_id', so a request reads it once.
+
+        Args:
+            id (str): The ID of the poll.
+            user_id (int): The ID of the user requesting the poll information.
+        """
+        await self.utils.validate_id(id=id)
+
+        version, user_actions, poll = await run_concurrently(
+            self.repository.get_version(id=id),
+            self.get_user_actions(id=id, user_id=user_id),
+            self.cache.get(id=id),
+        )
+
+        await self.utils.check_poll_privacy(user_id=user_id, poll=version)
+
+        owner: dict | None = await self.user_profile_service.a_get_owner(
+            user_id=version["user_id"]
+        )
+
+        return {"version": version, "user_actions": user_actions, "owner": owner, "poll": poll}
+
+    async def get_user_actions(self, id: str, user_id: int | None = None):
+        """
+        Returns the actions of a user on a poll and their version, None for anonymous
+        users or if there are none.
+        """
+        if not user_id:
+            return None
+
+        projection: dict = {
+            "_id": 0,
+            "has_voted": 1,
+            "has_shared": 1,
+            "has_bookmarked": 1,
+            "version": 1,
+        }
+        user_actions: BSON = await self.user_actions_repository.get_user_actions(
+            id=ObjectId(id), user_id=user_id, projection=projection
+        )
+
+        return user_actions
+
+    async def get_by_id(self, id: str, user_id: int | None = None, state: dict | None = None):
         """
         Retrieves detailed information about a poll by its ID, including user-specific actions.
 
+        The cached poll is only used if its version is the live one, so a poll changed by
+        another process is never served stale. The owner card is not cached, it is
+        attached to the poll.
+
         Args:
             id (str): The ID of the poll to retrieve.
             user_id (int): The ID of the user requesting the poll information.
+            state (dict): The state read by 'get_state' for this request, if any.
         """
-        await self.utils.validate_id(id=id)
-        poll: BSON = await self.repository.get_by_id(id=id)
-        await self.utils.check_poll_privacy(user_id=user_id, poll=poll)
+        if state is None:
+            state = await self.get_state(id=id, user_id=user_id)
 
-        poll: dict = await self.utils.bson_to_json(bson=poll)
-        poll = await self.utils.simplify_poll_data(poll=poll)
-        user_profile: dict = await self.user_profile_service.a_get_owner(user_id=poll["user_id"])
-        poll["user_profile"] = user_profile
+        poll: dict | None = state["poll"]
+        if poll is None or poll.get("version", 0) != state["version"].get("version", 0):
+            poll: BSON = await self.repository.get_by_id(id=id)
+            poll: dict = poll_to_json(poll=poll)
 
-        user_actions: dict = {}
-        if user_id:
-            projection: dict = {"_id": 0, "has_voted": 1, "has_shared": 1, "has_bookmarked": 1}
-            result: BSON = await self.user_actions_repository.get_user_actions(
-                id=ObjectId(poll["id"]), user_id=user_id, projection=projection
-            )
+            await self.cache.set(id=id, poll=poll)
 
-            if result != None:
-                result: dict = await self.utils.bson_to_json(bson=result)
-                user_actions = result
+        poll["user_profile"] = state["owner"]
+
+        user_actions: dict = {}
+        if state["user_actions"] is not None:
+            user_actions = user_actions_to_json(user_actions=state["user_actions"])
+            user_actions.pop("version", None)
 
         return poll, user_actions
 
+    async def get_etag(
+        self, id: str, user_id: int | None = None, state: dict | None = None
+    ) -> str:
+        """
+        Returns the ETag of the poll detail for a viewer, without loading the poll.
+
+        The ETag covers the poll version (every write of the poll, its counters
+        included), the version of the viewer's user actions (their votes, shares and
+        bookmarks, also when the buffered vote engine has not written the counters yet)
+        and the owner card.
+
+        Args:
+            id (str): The ID of the poll.
+            user_id (int): The ID of the user requesting the poll information.
+            state (dict): The state read by 'get_state' for this request, if any.
+        """
+        if state is None:
+            state = await self.get_state(id=id, user_id=user_id)
+
+        return self.etag.make_weak(
+            "poll",
+            id,
+            state["version"].get("version", 0),
+            user_id,
+            (state["user_actions"] or {}).get("version", 0),
+            sorted((state["owner"] or {}).items()),
+        )
+
     async def update(self, id: str, data: dict, user_id: int):
         """
         Updates a poll, including adding and removing options.
@@ -94,7 +186,9 @@ class PollService:
             user_id (int): The ID of the user attempting to update the poll.
         """
         await self.utils.validate_id(id=id)
-        poll: BSON = await self.repository.get_by_id(id=id)
+        poll: BSON = await self.repository.get_by_id(
+            id=id, projection=POLL_OWNERSHIP_PROJECTION
+        )
         await self.utils.is_owner(object=poll, user_id=user_id)
 
         # before serialization.
@@ -128,6 +222,16 @@ class PollService:
             add_options=add_options,
             del_options=del_options,
         )
+        await self.cache.invalidate(id=id)
+
+        # Move the poll and its votes to the new category.
+        category: str = poll_serializer.validated_data["category"]
+        if category != poll["category"]:
+            votes: int = poll.get("votes_counter", 0)
+            await self.category_stats_repository.increment(
+                category=poll["category"], polls=-1, votes=-votes
+            )
+            await self.category_stats_repository.increment(category=category, polls=1, votes=votes)
 
         return object_id
 
@@ -140,15 +244,24 @@ class PollService:
             user_id (int): The ID of the user attempting to delete the poll.
         """
         await self.utils.validate_id(id=id)
-        poll: BSON = await self.repository.get_by_id(id=id)
+        poll: BSON = await self.repository.get_by_id(
+            id=id, projection=POLL_OWNERSHIP_PROJECTION
+        )
         await self.utils.is_owner(object=poll, user_id=user_id)
 
         object_id: ObjectId = await self.repository.delete(id=id, poll=poll)
+        await self.cache.invalidate(id=id)
+        await self.category_stats_repository.increment(
+            category=poll["category"], polls=-1, votes=-poll.get("votes_counter", 0)
+        )
+
         return object_id
 
     async def add_option(self, id: str, user_id: int, data: dict):
         await self.utils.validate_id(id=id)
-        poll: BSON = await self.repository.get_by_id(id=id)
+        poll: BSON = await self.repository.get_by_id(
+            id=id, projection=POLL_OWNERSHIP_PROJECTION
+        )
         await self.utils.check_poll_privacy(user_id=user_id, poll=poll)
 
         option_serializer = OptionSerializer(data=data, partial=True)
@@ -162,11 +275,15 @@ class PollService:
         )
 
         object_id: ObjectId = await self.repository.add_option(id=id, option=option)
+        await self.cache.invalidate(id=id)
+
         return object_id
 
     async def del_option(self, id: str, data: dict, user_id: int):
         await self.utils.validate_id(id=id)
-        poll: BSON = await self.repository.get_by_id(id=id)
+        poll: BSON = await self.repository.get_by_id(
+            id=id, projection=POLL_OWNERSHIP_PROJECTION
+        )
         await self.utils.is_owner(object=poll, user_id=user_id)
 
         option: str = await self.option_utils.process_del_one_option(
@@ -180,4 +297,6 @@ class PollService:
         option_serializer.is_valid(raise_exception=True)
 
         object_id: ObjectId = await self.repository.del_option(id=id, option=option)
+        await self.cache.invalidate(id=id)
+
         return object_id
@@ -1,39 +1,88 @@
 from bson import BSON
 from bson.objectid import ObjectId
 
+from django.conf import settings
+
 from rest_framework.exceptions import ValidationError
 
 from apps.polls.repositories.user_actions_repository import UserActionsRepository
+from apps.polls.repositories.atomic_vote_repository import AtomicVoteRepository
+from apps.polls.repositories.vote_counter_buffer import BufferedVoteRepository
 from apps.polls.repositories.poll_repository import PollRepository
+from apps.polls.repositories.projections import POLL_OWNERSHIP_PROJECTION
+from apps.polls.repositories.category_stats_repository import CategoryStatsRepository
 from apps.polls.utils.poll_utils import PollUtils
+from apps.polls.utils.poll_cache import PollCache
+from utils.concurrency import run_concurrently
 from utils.mongo_connection import MongoDBSingleton
 
 
 class UserActionsService:
     polls_db = MongoDBSingleton().client["polls_db"]
     repository = UserActionsRepository()
+    atomic_vote_repository = AtomicVoteRepository()
+    buffered_vote_repository = BufferedVoteRepository()
     poll_repository = PollRepository()
+    category_stats_repository = CategoryStatsRepository()
     utils = PollUtils()
+    poll_cache = PollCache()
+
+    @property
+    def vote_repository(self):
+        """
+        The vote engine selected by the 'POLL_VOTE_ENGINE' setting.
+
+        "transaction" (default) writes votes in multi-document transactions, "atomic"
+        uses conditional single-document writes ('AtomicVoteRepository') and "buffered"
+        does the same but coalesces the poll counter updates ('BufferedVoteRepository').
+        """
+        engine: str = getattr(settings, "POLL_VOTE_ENGINE", "transaction")
+
+        if engine == "atomic":
+            return self.atomic_vote_repository
+
+        if engine == "buffered":
+            return self.buffered_vote_repository
+
+        return self.repository
+
+    async def validate_vote(self, poll: BSON, vote: str, raise_exception: bool = True):
+        """
+        Checks that the vote is one of the poll options.
+        """
+        if not any(o["option_text"] == vote for o in poll["options"]):
+            if raise_exception:
+                message: str = "Option not exist."
+                raise ValidationError(detail={"message": message})
+
+            return False
+
+        return True
 
     async def vote_add(self, id: str, user_id: int, vote: str):
         await self.utils.validate_id(id=id)
-        poll: BSON = await self.poll_repository.get_by_id(id=id)
-        await self.utils.check_poll_privacy(user_id=user_id, poll=poll)
 
         projection: dict = {"_id": 0, "poll_id": 1, "has_voted": 1}
-        result: BSON = await self.repository.get_user_actions(
-            id=ObjectId(id), user_id=user_id, projection=projection
+        poll, result = await run_concurrently(
+            self.poll_repository.get_by_id(id=id, projection=POLL_OWNERSHIP_PROJECTION),
+            self.repository.get_user_actions(
+                id=ObjectId(id), user_id=user_id, projection=projection
+            ),
         )
+        await self.utils.check_poll_privacy(user_id=user_id, poll=poll)
+        await self.validate_vote(poll=poll, vote=vote)
 
-        if result is None:
-            # Create a user actions document if it doesn't exist.
-            await self.repository.create(id=id, user_id=user_id)
-
-        elif "has_vote" in result:
+        # The vote engines upsert the user actions document if it doesn't exist.
+        if (result is not None) and ("has_voted" in result):
             message: str = "The user has already voted in this poll."
             raise ValidationError(detail={"message": message})
 
-        object_id: ObjectId = await self.repository.insert_vote(id=id, user_id=user_id, vote=vote)
+        object_id: ObjectId = await self.vote_repository.insert_vote(
+            id=id, user_id=user_id, vote=vote
+        )
+        await self.poll_cache.invalidate(id=id)
+        await self.category_stats_repository.increment(category=poll["category"], votes=1)
+
         return object_id
 
     async def vote_read(self, id: str, user_id: int):
@@ -49,57 +98,67 @@ class UserActionsService:
 
     async def vote_update(self, id: str, user_id: int, vote: str):
         await self.utils.validate_id(id=id)
-        poll: BSON = await self.poll_repository.get_by_id(id=id)
-        await self.utils.check_poll_privacy(user_id=user_id, poll=poll)
 
         projection: dict = {"_id": 0, "poll_id": 1, "has_voted": 1}
-        result: BSON = await self.repository.get_user_actions(
-            id=ObjectId(id), user_id=user_id, projection=projection
+        poll, result = await run_concurrently(
+            self.poll_repository.get_by_id(id=id, projection=POLL_OWNERSHIP_PROJECTION),
+            self.repository.get_user_actions(
+                id=ObjectId(id), user_id=user_id, projection=projection
+            ),
         )
+        await self.utils.check_poll_privacy(user_id=user_id, poll=poll)
+        await self.validate_vote(poll=poll, vote=vote)
 
-        if (result is None) or (not result["has_voted"]):
+        if (result is None) or (not result.get("has_voted")):
             message: str = "The user has not voted in this poll."
             raise ValidationError(detail={"message": message})
 
         del_vote: str = result["has_voted"]["vote"]
 
-        object_id: ObjectId = await self.repository.update_vote(
+        object_id: ObjectId = await self.vote_repository.update_vote(
             id=id, user_id=user_id, vote=vote, del_vote=del_vote
         )
+        await self.poll_cache.invalidate(id=id)
 
         return object_id
 
     async def vote_delete(self, id: str, user_id: int):
         await self.utils.validate_id(id=id)
-        poll: BSON = await self.poll_repository.get_by_id(id=id)
-        await self.utils.check_poll_privacy(user_id=user_id, poll=poll)
 
         projection: dict = {"_id": 0, "poll_id": 1, "has_voted": 1}
-        result: BSON = await self.repository.get_user_actions(
-            id=ObjectId(id), user_id=user_id, projection=projection
+        poll, result = await run_concurrently(
+            self.poll_repository.get_by_id(id=id, projection=POLL_OWNERSHIP_PROJECTION),
+            self.repository.get_user_actions(
+                id=ObjectId(id), user_id=user_id, projection=projection
+            ),
         )
+        await self.utils.check_poll_privacy(user_id=user_id, poll=poll)
 
-        if (result is None) or (not result["has_voted"]):
+        if (result is None) or (not result.get("has_voted")):
             message: str = "The user has not voted in this poll."
             raise ValidationError(detail={"message": message})
 
         del_vote: str = result["has_voted"]["vote"]
 
-        object_id: ObjectId = await self.repository.delete_vote(
+        object_id: ObjectId = await self.vote_repository.delete_vote(
             id=id, user_id=user_id, del_vote=del_vote
         )
+        await self.poll_cache.invalidate(id=id)
+        await self.category_stats_repository.increment(category=poll["category"], votes=-1)
 
         return object_id
 
     async def share(self, id: str, user_id: int):
         await self.utils.validate_id(id=id)
-        poll: BSON = await self.poll_repository.get_by_id(id=id)
-        await self.utils.check_poll_privacy(user_id=user_id, poll=poll)
 
         projection: dict = {"_id": 0, "poll_id": 1, "has_shared": 1}
-        result: BSON = await self.repository.get_user_actions(
-            id=ObjectId(id), user_id=user_id, projection=projection
+        poll, result = await run_concurrently(
+            self.poll_repository.get_by_id(id=id, projection=POLL_OWNERSHIP_PROJECTION),
+            self.repository.get_user_actions(
+                id=ObjectId(id), user_id=user_id, projection=projection
+            ),
         )
+        await self.utils.check_poll_privacy(user_id=user_id, poll=poll)
 
         if result is None:
             # Create a user actions document if it doesn't exist.
@@ -110,34 +169,42 @@ class UserActionsService:
             raise ValidationError(detail={"message": message})
 
         object_id: ObjectId = await self.repository.share(id=id, user_id=user_id)
+        await self.poll_cache.invalidate(id=id)
+
         return object_id
 
     async def unshare(self, id: str, user_id: int):
         await self.utils.validate_id(id=id)
-        poll: BSON = await self.poll_repository.get_by_id(id=id)
-        await self.utils.check_poll_privacy(user_id=user_id, poll=poll)
 
         projection: dict = {"_id": 0, "poll_id": 1, "has_shared": 1}
-        result: BSON = await self.repository.get_user_actions(
-            id=ObjectId(id), user_id=user_id, projection=projection
+        poll, result = await run_concurrently(
+            self.poll_repository.get_by_id(id=id, projection=POLL_OWNERSHIP_PROJECTION),
+            self.repository.get_user_actions(
+                id=ObjectId(id), user_id=user_id, projection=projection
+            ),
         )
+        await self.utils.check_poll_privacy(user_id=user_id, poll=poll)
 
         if (result is None) or (not result["has_shared"]):
             message: str = "The user has not shared in this poll."
             raise ValidationError(detail={"message": message})
 
         object_id: ObjectId = await self.repository.unshare(id=id, user_id=user_id)
+        await self.poll_cache.invalidate(id=id)
+
         return object_id
 
     async def bookmark(self, id: str, user_id: int):
         await self.utils.validate_id(id=id)
-        poll: BSON = await self.poll_repository.get_by_id(id=id)
-        await self.utils.check_poll_privacy(user_id=user_id, poll=poll)
 
         projection: dict = {"_id": 0, "poll_id": 1, "has_bookmarked": 1}
-        result: BSON = await self.repository.get_user_actions(
-            id=ObjectId(id), user_id=user_id, projection=projection
+        poll, result = await run_concurrently(
+            self.poll_repository.get_by_id(id=id, projection=POLL_OWNERSHIP_PROJECTION),
+            self.repository.get_user_actions(
+                id=ObjectId(id), user_id=user_id, projection=projection
+            ),
         )
+        await self.utils.check_poll_privacy(user_id=user_id, poll=poll)
 
         if result is None:
             # Create a user actions document if it doesn't exist.
@@ -148,21 +215,27 @@ class UserActionsService:
             raise ValidationError(detail={"message": message})
 
         object_id: ObjectId = await self.repository.bookmark(id=id, user_id=user_id)
+        await self.poll_cache.invalidate(id=id)
+
         return object_id
 
     async def unbookmark(self, id: str, user_id: int):
         await self.utils.validate_id(id=id)
-        poll: BSON = await self.poll_repository.get_by_id(id=id)
-        await self.utils.check_poll_privacy(user_id=user_id, poll=poll)
 
         projection: dict = {"_id": 0, "poll_id": 1, "has_bookmarked": 1}
-        result: BSON = await self.repository.get_user_actions(
-            id=ObjectId(id), user_id=user_id, projection=projection
+        poll, result = await run_concurrently(
+            self.poll_repository.get_by_id(id=id, projection=POLL_OWNERSHIP_PROJECTION),
+            self.repository.get_user_actions(
+                id=ObjectId(id), user_id=user_id, projection=projection
+            ),
         )
+        await self.utils.check_poll_privacy(user_id=user_id, poll=poll)
 
         if (result is None) or (not result["has_bookmarked"]):
             message: str = "The user has not bookmarked in this poll."
             raise ValidationError(detail={"message": message})
 
         object_id: ObjectId = await self.repository.unbookmark(id=id, user_id=user_id)
+        await self.poll_cache.invalidate(id=id)
+
         return object_id
@@ -1,3 +1,287 @@
-from django.test import TestCase
+import asyncio
+import os
+import random
+from base64 import urlsafe_b64encode
+from datetime import datetime, timedelta, timezone
+from unittest import skipUnless
 
-# Create your tests here.
+import bson
+from bson import json_util
+from bson.objectid import ObjectId
+from bson.raw_bson import RawBSONDocument
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from rest_framework.exceptions import ValidationError
+
+from apps.polls.management.commands.vote_harness import Command as VoteHarness
+from apps.polls.repositories.atomic_vote_repository import AtomicVoteRepository
+from apps.polls.repositories.poll_list_repository import PollListRepository
+from apps.polls.repositories.user_actions_repository import UserActionsRepository
+from apps.polls.utils.json_converter import poll_comment_to_json, poll_to_json
+from apps.polls.utils.poll_comment_utils import PollCommentUtils
+from utils.pagination import Pagination
+
+try:
+    from mongomock_motor import AsyncMongoMockClient
+except ImportError:
+    AsyncMongoMockClient = None
+
+
+class CursorTests(SimpleTestCase):
+    pagination = Pagination()
+    repository = PollListRepository()
+
+    def encode_raw(self, values) -> str:
+        return urlsafe_b64encode(json_util.dumps(values).encode()).decode()
+
+    def test_round_trip_recent_sort(self):
+        values: list = [datetime(2024, 1, 2, 3, 4, 5, 123000), ObjectId()]
+        cursor: str = self.pagination.encode_cursor(values=values)
+
+        decoded: list = self.pagination.decode_cursor(
+            cursor=cursor, types=self.repository.get_key_types(sort=self.repository.RECENT_SORT)
+        )
+
+        self.assertEqual(decoded, values)
+
+    def test_round_trip_popular_sort(self):
+        values: list = [42, ObjectId()]
+        cursor: str = self.pagination.encode_cursor(values=values)
+
+        decoded: list = self.pagination.decode_cursor(
+            cursor=cursor, types=self.repository.get_key_types(sort=self.repository.POPULAR_SORT)
+        )
+
+        self.assertEqual(decoded, values)
+
+    def test_empty_cursor_is_first_page(self):
+        self.assertIsNone(self.pagination.decode_cursor(cursor=""))
+
+    def test_malformed_cursors_are_rejected(self):
+        types: list = self.repository.get_key_types(sort=self.repository.RECENT_SORT)
+        cursors: list = [
+            "not base64 !",
+            urlsafe_b64encode(b"not json").decode(),
+            self.encode_raw({"created_at": 1}),
+            self.encode_raw([datetime(2024, 1, 1)]),
+            self.encode_raw([datetime(2024, 1, 1), ObjectId(), ObjectId()]),
+            # Operator documents must never reach the query.
+            self.encode_raw([{"$regex": ".*"}, ObjectId()]),
+            self.encode_raw([datetime(2024, 1, 1), {"$exists": True}]),
+            self.encode_raw([datetime(2024, 1, 1), str(ObjectId())]),
+            self.encode_raw([1, ObjectId()]),
+            # Extended JSON that json_util can't decode.
+            urlsafe_b64encode(b'[{"$oid": 5}, 1]').decode(),
+            urlsafe_b64encode(b'[{"$binary": 1}]').decode(),
+            urlsafe_b64encode(b'[{"$date": {"$numberLong": "99999999999999999999"}}, 1]').decode(),
+            urlsafe_b64encode(b'[{"$date": {}}, 1]').decode(),
+        ]
+
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(ValidationError):
+                    self.pagination.decode_cursor(cursor=cursor, types=types)
+
+    def test_bool_is_not_a_counter(self):
+        types: list = self.repository.get_key_types(sort=self.repository.POPULAR_SORT)
+        cursor: str = self.encode_raw([True, ObjectId()])
+
+        self.assertIsNone(
+            self.pagination.decode_cursor(cursor=cursor, types=types, raise_exception=False)
+        )
+
+
+class JSONConverterTests(SimpleTestCase):
+    """
+    The single pass converters must produce the same output as 'bson_to_json' followed
+    by 'simplify_poll_data' / 'simplify_poll_comment_data'.
+    """
+
+    utils = PollCommentUtils()
+
+    dates: list = [
+        datetime(2024, 1, 2, 3, 4, 5),
+        datetime(2024, 1, 2, 3, 4, 5, 123000),
+        datetime(2024, 1, 2, 3, 4, 5, 999999),
+        datetime(2024, 1, 2, 3, 4, 5, 500),
+        datetime(1969, 12, 31, 23, 59, 59),
+        datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=2))),
+    ]
+
+    def make_poll(self, created_at: datetime) -> dict:
+        return {
+            "_id": ObjectId(),
+            "title": "Poll title",
+            "privacy": "public",
+            "user_id": 1,
+            "created_at": created_at,
+            "options": [
+                {"user_id": 1, "option_text": "Option 0", "votes": 0},
+                {"user_id": 2, "option_text": "Option 1", "votes": 3},
+            ],
+            "votes_counter": 3,
+            "ratio": 0.5,
+            "tags": None,
+            "owner_id": ObjectId(),
+            "version": 1,
+            "authenticated_user_actions": [
+                {"has_voted": {"vote": "Option 1", "voted_at": created_at}, "has_shared": None}
+            ],
+        }
+
+    def make_comment(self, created_at: datetime) -> dict:
+        return {
+            "_id": ObjectId(),
+            "user_id": 1,
+            "comment": "Comment text",
+            "created_at": created_at,
+            "poll_id": ObjectId(),
+            "version": 1,
+        }
+
+    async def two_step_poll(self, poll: dict) -> dict:
+        data: dict = await self.utils.bson_to_json(bson=poll)
+        return await self.utils.simplify_poll_data(poll=data)
+
+    async def two_step_comment(self, comment: dict) -> dict:
+        data: dict = await self.utils.bson_to_json(bson=comment)
+        return await self.utils.simplify_poll_comment_data(comment=data)
+
+    async def test_poll_parity(self):
+        for created_at in self.dates:
+            with self.subTest(created_at=created_at):
+                poll: dict = self.make_poll(created_at=created_at)
+
+                self.assertEqual(poll_to_json(poll=poll), await self.two_step_poll(poll=poll))
+
+    async def test_raw_poll_parity(self):
+        poll: dict = self.make_poll(created_at=self.dates[1])
+        raw = RawBSONDocument(bson.encode(poll))
+
+        self.assertEqual(poll_to_json(poll=raw), await self.two_step_poll(poll=poll))
+
+    async def test_comment_parity(self):
+        for created_at in self.dates:
+            with self.subTest(created_at=created_at):
+                comment: dict = self.make_comment(created_at=created_at)
+
+                self.assertEqual(
+                    poll_comment_to_json(comment=comment),
+                    await self.two_step_comment(comment=comment),
+                )
+
+    def test_poll_exclude(self):
+        poll: dict = self.make_poll(created_at=self.dates[0])
+        data: dict = poll_to_json(poll=poll, exclude=("options", "authenticated_user_actions"))
+
+        self.assertNotIn("options", data)
+        self.assertNotIn("authenticated_user_actions", data)
+        self.assertEqual(data["id"], str(poll["_id"]))
+
+
+class AtomicVoteTests:
+    """
+    The counters of the atomic vote engine under concurrent duplicated requests, with
+    the sequences of the 'vote_harness' command. 'get_polls_db' returns the database.
+    """
+
+    harness = VoteHarness()
+
+    async def get_polls_db(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        AtomicVoteRepository.unique_index_checked = False
+
+    def tearDown(self):
+        AtomicVoteRepository.unique_index_checked = False
+
+    async def run_sequences(self, polls_db, users: int, rounds: int, duplicates: int):
+        """
+        Runs the vote sequences of 'users' users on a new poll, returns the counter
+        mismatches and the request stats.
+        """
+        await polls_db.user_actions.create_indexes(UserActionsRepository.INDEXES)
+        poll_id: str = await self.harness.create_poll(polls_db=polls_db)
+
+        repository = AtomicVoteRepository()
+        repository.polls_db = polls_db
+        stats: dict = {"applied": 0, "rejected": 0, "errors": 0}
+
+        random.seed(0)
+        await asyncio.gather(
+            *(
+                self.harness.run_user(
+                    repository, polls_db, poll_id, user_id, rounds, duplicates, stats
+                )
+                for user_id in range(1, users + 1)
+            )
+        )
+
+        mismatches: list = await self.harness.check_counters(polls_db=polls_db, poll_id=poll_id)
+        return mismatches, stats
+
+    async def test_duplicate_votes_keep_the_counters(self):
+        polls_db = await self.get_polls_db()
+
+        # A single round per user: every sequence is an insert.
+        mismatches, stats = await self.run_sequences(polls_db, users=50, rounds=1, duplicates=3)
+
+        self.assertEqual(mismatches, [])
+        self.assertEqual(stats, {"applied": 50, "rejected": 100, "errors": 0})
+
+    async def test_missing_unique_index_is_refused(self):
+        polls_db = await self.get_polls_db()
+        poll_id: str = await self.harness.create_poll(polls_db=polls_db)
+
+        repository = AtomicVoteRepository()
+        repository.polls_db = polls_db
+
+        with self.assertRaises(ImproperlyConfigured):
+            await repository.insert_vote(id=poll_id, user_id=1, vote="Option A")
+
+        self.assertEqual(await polls_db.user_actions.count_documents({}), 0)
+
+
+@skipUnless(AsyncMongoMockClient, "mongomock-motor is not installed")
+class MockAtomicVoteTests(AtomicVoteTests, SimpleTestCase):
+    """
+    In-memory database. mongomock doesn't implement array filters, which the vote
+    updates and deletes use, so only the inserts are run.
+    """
+
+    async def get_polls_db(self):
+        return AsyncMongoMockClient()["polls_vote_tests"]
+
+
+@skipUnless(os.getenv("MONGO_URI"), "no MongoDB server ('MONGO_URI')")
+class MongoAtomicVoteTests(AtomicVoteTests, SimpleTestCase):
+    """
+    Scratch database of the MongoDB server of 'MONGO_URI', dropped after each test.
+    """
+
+    database: str = "polls_vote_tests"
+
+    async def get_polls_db(self):
+        self.client = AsyncIOMotorClient(os.getenv("MONGO_URI"))
+        await self.client.drop_database(self.database)
+        return self.client[self.database]
+
+    async def asyncTearDown(self):
+        await self.client.drop_database(self.database)
+        self.client.close()
+
+    async def test_duplicate_vote_sequences_keep_the_counters(self):
+        polls_db = await self.get_polls_db()
+
+        # Inserts, updates and deletes.
+        mismatches, stats = await self.run_sequences(polls_db, users=50, rounds=5, duplicates=3)
+
+        self.assertEqual(mismatches, [])
+        self.assertEqual(stats["errors"], 0)
+        self.assertEqual(stats["applied"] + stats["rejected"], 50 * 5 * 3)
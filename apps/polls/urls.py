@@ -17,8 +17,9 @@ from .views.poll_list_by_user_views import (
 )
 
 from .views.poll_list_by_category_view import PollListByCategoryAPIView
-from .views.categories_view import CategoriesAPIView
+from .views.categories_view import CategoriesAPIView, CategoriesDataAPIView
 from .views.poll_list_by_keyword_view import PollListByKeywordAPIView
+from .views.mongo_metrics_view import MongoPoolMetricsAPIView
 
 urlpatterns = [
     # CRUD Poll.
@@ -137,6 +138,11 @@ urlpatterns = [
         view=CategoriesAPIView.as_view(),
         name="categories",
     ),
+    path(
+        route="categories/data",
+        view=CategoriesDataAPIView.as_view(),
+        name="categories_data",
+    ),
     path(
         route="category/<str:category>",
         view=PollListByCategoryAPIView.as_view(),
@@ -148,4 +154,10 @@ urlpatterns = [
         view=PollListByKeywordAPIView.as_view(),
         name="polls_search",
     ),
+    # Metrics.
+    path(
+        route="metrics/mongo-pool",
+        view=MongoPoolMetricsAPIView.as_view(),
+        name="metrics_mongo_pool",
+    ),
 ]
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+
+from bson import json_util
+from bson.objectid import ObjectId
+from bson.raw_bson import RawBSONDocument
+
+
+# Single pass BSON to JSON converters for the documents of 'polls_db'.
+#
+# 'json_util._json_convert' walks every value through a chain of type checks and wraps
+# ObjectIds and dates ({"$oid": ...}, {"$date": ...}), which 'simplify_*' unwrap again.
+# These converters produce the API shape directly: the document '_id' becomes a str
+# 'id', top level dates are ISO 8601 strings (same format as json_util). Values of
+# other types, and nested ObjectIds and dates, are converted exactly like json_util.
+
+
+def date_to_json(value: datetime):
+    """
+    Formats a date like json_util (relaxed mode), without the "$date" wrapper.
+    """
+    if value.tzinfo is not None:
+        offset: timedelta | None = value.utcoffset()
+        if offset:
+            return json_util._json_convert(value)["$date"]
+        value = value.replace(tzinfo=None)
+
+    if value.year < 1970:
+        return json_util._json_convert(value)["$date"]
+
+    # json_util only writes the milliseconds when they are not zero.
+    if value.microsecond >= 1000:
+        return value.isoformat(timespec="milliseconds") + "Z"
+
+    return value.isoformat(timespec="seconds") + "Z"
+
+
+def value_to_json(value):
+    """
+    Converts a nested value with the same output as 'json_util._json_convert'.
+    """
+    value_type = type(value)
+
+    if value_type in (str, int, bool, float) or value is None:
+        return value
+
+    if value_type is dict or value_type is RawBSONDocument:
+        return {key: value_to_json(item) for key, item in value.items()}
+
+    if value_type is list:
+        return [value_to_json(item) for item in value]
+
+    if value_type is ObjectId:
+        return {"$oid": str(value)}
+
+    if value_type is datetime:
+        return {"$date": date_to_json(value)}
+
+    return json_util._json_convert(value)
+
+
+def user_actions_to_json(user_actions: dict):
+    """
+    Converts a user actions document, the output is the same as 'bson_to_json'.
+    """
+    return {key: value_to_json(value) for key, value in user_actions.items()}
+
+
+def poll_to_json(poll: dict, exclude: tuple = ()):
+    """
+    Converts a poll document, the output is the same as 'bson_to_json' followed by
+    'simplify_poll_data'. The 'exclude' fields are left out.
+    """
+    data: dict = {}
+
+    for key, value in poll.items():
+        if key == "_id" or key in exclude:
+            continue
+
+        if key == "created_at":
+            data[key] = date_to_json(value)
+
+        elif key == "authenticated_user_actions":
+            data[key] = [user_actions_to_json(user_actions) for user_actions in value]
+
+        else:
+            data[key] = value_to_json(value)
+
+    data["id"] = str(poll["_id"])
+
+    return data
+
+
+def poll_comment_to_json(comment: dict):
+    """
+    Converts a comment document, the output is the same as 'bson_to_json' followed by
+    'simplify_poll_comment_data'.
+    """
+    data: dict = {}
+
+    for key, value in comment.items():
+        if key == "_id":
+            continue
+
+        if key == "created_at":
+            data[key] = date_to_json(value)
+
+        elif key == "poll_id":
+            data[key] = str(value)
+
+        else:
+            data[key] = value_to_json(value)
+
+    data["id"] = str(comment["_id"])
+
+    return data
@@ -0,0 +1,39 @@
+from bson.objectid import ObjectId
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+class PollCache:
+    """
+    Cache of the viewer-independent part of a poll detail (the poll data, without the
+    owner card).
+
+    Uses the Django cache selected by the 'POLL_CACHE_ALIAS' setting, so any backend
+    configured in 'CACHES' works (local memory, file based, Redis...). Entries are
+    invalidated by the writes of this process, readers also compare the cached version
+    with the live one, as a per-process cache is not invalidated by the other workers.
+    """
+
+    key_prefix: str = "poll_detail"
+
+    @property
+    def cache(self):
+        return caches[getattr(settings, "POLL_CACHE_ALIAS", "default")]
+
+    def get_key(self, id: str | ObjectId):
+        return f"{self.key_prefix}:{id}"
+
+    async def get(self, id: str | ObjectId):
+        """
+        Returns the cached poll detail, or None if it is not cached.
+        """
+        poll: dict | None = await self.cache.aget(self.get_key(id=id))
+        return poll
+
+    async def set(self, id: str | ObjectId, poll: dict):
+        timeout: int | None = getattr(settings, "POLL_CACHE_TIMEOUT", 60)
+        await self.cache.aset(self.get_key(id=id), poll, timeout=timeout)
+
+    async def invalidate(self, id: str | ObjectId):
+        await self.cache.adelete(self.get_key(id=id))
@@ -12,8 +12,8 @@ from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny
 # Async Rest Framework support.
 from adrf.decorators import api_view
-# MongoDB connection.
-from utils.mongo_connection import MongoDBSingleton
+# Category statistics.
+from apps.polls.repositories.category_stats_repository import CategoryStatsRepository
 # PyMongo.
 from pymongo.errors import PyMongoError
 # Utils.
@@ -88,51 +88,19 @@ def categories(request):
 @permission_classes([AllowAny])
 async def categories_data(request):
     try:
-        # Connect to the MongoDB databases.
-        polls_db = MongoDBSingleton().client['polls_db']
-
-        # Get the categories data.
-        aggregated_data = await polls_db.polls.aggregate(
-            [
-                {
-                    '$group': {
-                        '_id': '$category',
-                        'total_polls': {'$sum': 1},
-                        'total_votes': {'$sum': '$total_votes'}
-                    }
-                },
-                {
-                    '$project': {
-                        '_id': 0,
-                        'category': '$_id',
-                        'total_polls': 1,
-                        'total_votes': 1
-                    }
-                }
-            ]
-        ).to_list(None)
+        # Get the categories data (materialized in 'category_stats').
+        stats = await CategoryStatsRepository().get_all()
 
         # Add category data in data categories.
         data_categories = []
         for category in CATEGORIES['list']:
-            in_aggregated_data = False
-            for category_data in aggregated_data:
-                if category['value'] == category_data['category']:
-                    data_categories.append({
-                        'text': category['text'],
-                        'value': category['value'],
-                        'total_polls': category_data['total_polls'],
-                        'total_votes': category_data['total_votes']
-                    })
-                    in_aggregated_data = True
-
-            if not in_aggregated_data:
-                data_categories.append({
-                    'text': category['text'],
-                    'value': category['value'],
-                    'total_polls': 0,
-                    'total_votes': 0
-                })
+            category_data = stats.get(category['value'], {})
+            data_categories.append({
+                'text': category['text'],
+                'value': category['value'],
+                'total_polls': category_data.get('total_polls', 0),
+                'total_votes': category_data.get('total_votes', 0)
+            })
 
         # Time To Live.
         TTL = timedelta(days=1)
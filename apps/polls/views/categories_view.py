@@ -5,19 +5,35 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from adrf.views import APIView
 
+from apps.polls.services.category_service import CategoryService
 from apps.polls.utils.categorys import CATEGORIES
+from utils.static_payload import StaticPayload
 
 
 class CategoriesAPIView(APIView):
     permission_classes = [AllowAny]
 
+    # Rendered and compressed once, at import.
+    payload = StaticPayload(data=CATEGORIES, max_age=int(timedelta(weeks=1).total_seconds()))
+
+    async def get(self, request):
+        return self.payload.response(request=request)
+
+
+class CategoriesDataAPIView(APIView):
+    permission_classes = [AllowAny]
+
+    service = CategoryService()
+
     async def get(self, request):
+        data: list[dict] = await self.service.get_categories_data()
+
         # Time To Live.
-        TTL = timedelta(weeks=1)
+        TTL = timedelta(days=1)
         expiration_date = datetime.utcnow() + TTL
 
         # Cache Control.
-        response = Response(data=CATEGORIES, status=status.HTTP_200_OK)
+        response = Response(data=data, status=status.HTTP_200_OK)
         response["Cache-Control"] = f"max-age={int(TTL.total_seconds())}"
         response["Expires"] = expiration_date.strftime("%a, %d %b %Y %H:%M:%S GMT")
 
@@ -0,0 +1,23 @@
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.permissions import IsAdminUser
+from rest_framework.authentication import SessionAuthentication
+
+from adrf.views import APIView
+
+from utils.mongo_metrics import pool_metrics
+
+
+class MongoPoolMetricsAPIView(APIView):
+    """
+    Returns the MongoDB connection pool metrics of the worker that serves the request
+    (checkout wait times, failed checkouts, open and checked out connections).
+
+    Restricted to staff users.
+    """
+
+    authentication_classes = [SessionAuthentication]
+    permission_classes = [IsAdminUser]
+
+    async def get(self, request):
+        return Response(data=pool_metrics.snapshot(), status=status.HTTP_200_OK)
@@ -115,7 +115,6 @@ async def poll_create(request):
                         'privacy': poll_data['privacy'],
                         'category': poll_data['category'],
                         'options': options,
-                        'voters': [],
                         'votes_counter': 0,
                         'shares_counter': 0,
                         'bookmarks_counter': 0,
@@ -5,20 +5,28 @@ from rest_framework.exceptions import ValidationError
 from adrf.views import APIView
 
 from apps.polls.services.poll_comment_list_service import PollCommentListService
+from utils.etag import ETag
 
 
 class PollCommentListAPIVIew(APIView):
     permission_classes = [AllowAny]
 
     service = PollCommentListService()
+    etag = ETag()
 
     async def get(self, request, id: str):
         page: int = int(request.GET.get("page", "1"))
         page_size: int = int(request.GET.get("page_size", "4"))
         user_id: int = request.user.id
 
-        data: dict = await self.service.get_by_poll_id(
+        # Conditional requests are answered without loading the comments.
+        if request.META.get("HTTP_IF_NONE_MATCH"):
+            etag: str = await self.service.get_etag(poll_id=id, user_id=user_id)
+            if self.etag.matches(request=request, etag=etag):
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        data, etag = await self.service.get_by_poll_id(
             poll_id=id, page=page, page_size=page_size, user_id=user_id
         )
 
-        return Response(data=data, status=status.HTTP_200_OK)
+        return Response(data=data, status=status.HTTP_200_OK, headers={"ETag": etag})
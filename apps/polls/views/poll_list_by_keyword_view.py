@@ -16,6 +16,7 @@ class PollListByKeywordAPIView(APIView):
         keyword: str = request.GET.get("query")
         page: int = int(request.GET.get("page", "1"))
         page_size: int = int(request.GET.get("page_size", "4"))
+        cursor: str | None = request.GET.get("cursor")
         user_id: int = request.user.id
 
         try:
@@ -23,11 +24,11 @@ class PollListByKeywordAPIView(APIView):
                 message: str = "Keyword is not provided"
                 raise ValidationError({"message": message})
 
+            data: dict = await self.service.get_by_keyword(
+                keyword=keyword, page=page, page_size=page_size, user_id=user_id, cursor=cursor
+            )
+
         except ValidationError as error:
             return Response(data=error.detail, status=status.HTTP_400_BAD_REQUEST)
 
-        data: dict = await self.service.get_by_keyword(
-            keyword=keyword, page=page, page_size=page_size, user_id=user_id
-        )
-
         return Response(data=data, status=status.HTTP_200_OK)
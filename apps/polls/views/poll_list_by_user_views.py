@@ -1,6 +1,7 @@
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
+from rest_framework.exceptions import ValidationError
 from adrf.views import APIView
 
 from apps.polls.services.poll_list_service import PollListService
@@ -14,11 +15,16 @@ class PollListByUserIdAPIView(APIView):
     async def get(self, request, id: int):
         page: int = int(request.GET.get("page", "1"))
         page_size: int = int(request.GET.get("page_size", "4"))
+        cursor: str | None = request.GET.get("cursor")
         user_id: int = request.user.id
 
-        data: dict = await self.service.get_by_user_id(
-            id=id, page=page, page_size=page_size, user_id=user_id
-        )
+        try:
+            data: dict = await self.service.get_by_user_id(
+                id=id, page=page, page_size=page_size, user_id=user_id, cursor=cursor
+            )
+
+        except ValidationError as error:
+            return Response(data=error.detail, status=status.HTTP_400_BAD_REQUEST)
 
         return Response(data=data, status=status.HTTP_200_OK)
 
@@ -9,6 +9,7 @@ from rest_framework.authentication import SessionAuthentication
 from adrf.views import APIView
 
 from apps.polls.services.poll_service import PollService
+from utils.etag import ETag
 
 
 class PollAPIView(APIView):
@@ -23,6 +24,7 @@ class PollAPIView(APIView):
     permission_classes = [IsAuthenticatedOrReadOnly]
 
     service = PollService()
+    etag = ETag()
 
     async def post(self, request):
         """
@@ -68,8 +70,13 @@ class PollAPIView(APIView):
         Access Control:
             For private polls, only the owner can access the information.
 
+        Conditional GET:
+            Responses carry a weak ETag, a request with a matching 'If-None-Match'
+            header gets a 304 Not Modified response without body.
+
         Responses:
             - 200 OK: Poll details and actions of the authenticated user.
+            - 304 Not Modified: The poll has not changed.
             - 400 Bad Request: Invalid poll ID.
             - 403 Forbidden: Permission issues (private poll access).
             - 404 Not Found: Poll not found.
@@ -78,7 +85,14 @@ class PollAPIView(APIView):
         user_id: int = request.user.id
 
         try:
-            poll, user_actions = await self.service.get_by_id(id=id, user_id=user_id)
+            # Read once, for the ETag and the poll detail.
+            state: dict = await self.service.get_state(id=id, user_id=user_id)
+
+            etag: str = await self.service.get_etag(id=id, user_id=user_id, state=state)
+            if self.etag.matches(request=request, etag=etag):
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+            poll, user_actions = await self.service.get_by_id(id=id, user_id=user_id, state=state)
 
         except ValidationError as error:
             return Response(data=error.detail, status=status.HTTP_400_BAD_REQUEST)
@@ -92,6 +106,7 @@ class PollAPIView(APIView):
         return Response(
             data={"poll": poll, "authenticated_user_actions": user_actions},
             status=status.HTTP_200_OK,
+            headers={"ETag": etag},
         )
 
     async def patch(self, request, id: str):
@@ -140,11 +140,10 @@ async def vote_add(request, id):
                     )
 
                 await polls_db.polls.bulk_write([
-                    # Add user ID to voters list in the poll document.
+                    # Add count to votes counter in the poll document.
                     UpdateOne(
                         {'_id': ObjectId(id)},
                         {
-                            '$push': {'voters': request.user.id},
                             '$inc': {'votes_counter': 1}
                         }
                     ),
@@ -485,7 +484,7 @@ async def vote_update(request, id):
 # Checks and removes the user's voted action status if it exists.
 
 # --- Poll Counters Update ---
-# Removes the user ID from the voters list and decrements the votes for the removed vote option.
+# Decrements the votes counter and the votes for the removed vote option.
 
 # --- Error Handling ---
 # Handles different scenarios with appropriate HTTP response codes.
@@ -553,11 +552,10 @@ async def vote_delete(request, id):
                     )
 
                 await polls_db.polls.bulk_write([
-                    # Remove user ID to voters list in the poll document.
+                    # Remove count from votes counter in the poll document.
                     UpdateOne(
                         {'_id': ObjectId(id)},
                         {
-                            '$pull': {'voters': request.user.id},
                             '$inc': {'votes_counter': -1}
                         }
                     ),
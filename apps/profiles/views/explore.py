@@ -1,8 +1,5 @@
-# BSON.
-from bson import json_util
 # Django.
 from django.contrib.auth.models import User
-from django.core.paginator import Paginator
 # Rest Framework.
 from rest_framework import status
 from rest_framework.response import Response
@@ -11,8 +8,8 @@ from rest_framework.decorators import permission_classes
 from rest_framework.permissions import AllowAny
 # Async Rest Framework support.
 from adrf.decorators import api_view
-# MongoDB connection.
-from utils.mongo_connection import MongoDBSingleton
+# Active users ranking.
+from apps.polls.repositories.active_users_repository import ActiveUsersRepository
 # PyMongo.
 from pymongo.errors import PyMongoError
 
@@ -61,64 +58,46 @@ async def explore_users(request):
     page_size = request.GET.get('page_size') or '4'
 
     try:
-        # Connect to the MongoDB databases.
-        polls_db = MongoDBSingleton().client['polls_db']
+        page_number = int(page)
+        page_size_number = int(page_size)
 
-        user_poll_actions = await polls_db.user_actions.find(
-            {},
-            {'_id': 0, 'poll_id': 1}
-        ).to_list(None)
-
-        users_bson = await polls_db.user_actions.aggregate([
-            {'$match': {
-                'poll_id': {'$in': [x['poll_id'] for x in user_poll_actions]}}
-             },
-            {'$group': {'_id': '$user_id'}}
-        ]).to_list(None)
-
-        new_users_bson = [
-            user for user in users_bson if user['_id'] != request.user.id]
-
-        # Convert BSON to JSON.
-        users_json = json_util._json_convert(new_users_bson)
+        # Get a page of the active users ranking (indexed range read).
+        user_ids, total_items = await ActiveUsersRepository().get_page(
+            skip=(max(page_number, 1) - 1) * page_size_number,
+            limit=page_size_number,
+            exclude_user_id=request.user.id
+        )
 
         ### PAGINATION. ###
 
-        if page:
-            page_number = int(page)
-            page_size_number = int(page_size)
-            paginator = Paginator(users_json, page_size_number)
-
-            total_pages = paginator.num_pages
-            total_items = paginator.count
-
-            if total_items == 0:
-                return Response(
-                    data={
-                        'items': [],
-                        'message': 'No result found',
-                        'paginator':
-                        {
-                            'page': page_number,
-                            'total_pages':  total_pages,
-                            'total_items': total_items,
-                            'has_previous': False,
-                            'has_next': False,
-                        }
-                    })
-
-            page_obj = paginator.get_page(page_number)
-            has_previous = page_obj.has_previous()
-            has_next = page_obj.has_next()
-
-            message = ''
-            if not has_next:
-                message = 'No more results'
+        total_pages = (total_items + page_size_number - 1) // page_size_number
+
+        if total_items == 0:
+            return Response(
+                data={
+                    'items': [],
+                    'message': 'No result found',
+                    'paginator':
+                    {
+                        'page': page_number,
+                        'total_pages':  total_pages,
+                        'total_items': total_items,
+                        'has_previous': False,
+                        'has_next': False,
+                    }
+                })
+
+        has_previous = page_number > 1
+        has_next = page_number < total_pages
+
+        message = ''
+        if not has_next:
+            message = 'No more results'
 
         ### PAGINATION. ###
 
         # Users list.
-        users_list = page_obj.object_list if page else users_json
+        users_list = [{'_id': user_id} for user_id in user_ids]
 
         # Extract relevant information for each poll.
         items = []
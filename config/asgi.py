@@ -13,4 +13,25 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported once the apps are loaded.
+from apps.polls.repositories.vote_counter_buffer import BufferedVoteRepository  # noqa: E402
+from config.checks import check_vote_indexes, report_sync_middleware  # noqa: E402
+from config.lifespan import LifespanApplication  # noqa: E402
+from utils.mongo_connection import MongoDBSingleton  # noqa: E402
+
+application = LifespanApplication(
+    django_application,
+    on_startup=[
+        # Reports the middleware that make the async views hop threads.
+        report_sync_middleware,
+        # The atomic and buffered vote engines need the unique index of 'user_actions'.
+        check_vote_indexes,
+    ],
+    on_shutdown=[
+        # The pending vote counters are written before the client is closed.
+        BufferedVoteRepository.buffer.stop,
+        MongoDBSingleton().close,
+    ],
+)
@@ -0,0 +1,93 @@
+import logging
+
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.module_loading import import_string
+
+from apps.polls.repositories.atomic_vote_repository import AtomicVoteRepository
+
+logger = logging.getLogger(__name__)
+
+# The 'MiddlewareMixin' hooks that Django runs with 'sync_to_async' in async mode.
+MIDDLEWARE_MIXIN_HOOKS: tuple = (
+    "process_request",
+    "process_view",
+    "process_template_response",
+    "process_response",
+    "process_exception",
+)
+
+
+@register(Tags.compatibility)
+def check_async_middleware(app_configs=None, **kwargs) -> list:
+    """
+    Reports the middleware of 'MIDDLEWARE' that can't run async.
+
+    Under ASGI, Django adapts the handler chain around a sync-only middleware
+    ('async_to_sync' / 'sync_to_async'), so every request to the async views hops to a
+    thread and back.
+    """
+    warnings: list = []
+
+    for middleware_path in settings.MIDDLEWARE:
+        middleware = import_string(middleware_path)
+
+        if not getattr(middleware, "async_capable", False):
+            warnings.append(
+                Warning(
+                    f"The middleware '{middleware_path}' is not async capable, requests "
+                    "to the async views are adapted to run it.",
+                    hint="Set 'async_capable = True' and handle async 'get_response' "
+                    "(see 'config.middleware.mongo_middleware').",
+                    obj=middleware_path,
+                    id="config.W001",
+                )
+            )
+
+    return warnings
+
+
+def get_thread_hooks() -> list:
+    """
+    Returns the hooks of the async capable 'MiddlewareMixin' middleware of 'MIDDLEWARE',
+    each runs in a thread ('sync_to_async') when the handler chain is async.
+    """
+    hooks: list = []
+
+    for middleware_path in settings.MIDDLEWARE:
+        middleware = import_string(middleware_path)
+
+        if issubclass(middleware, MiddlewareMixin) and middleware.async_capable:
+            hooks += [
+                f"{middleware.__name__}.{hook}"
+                for hook in MIDDLEWARE_MIXIN_HOOKS
+                if hasattr(middleware, hook)
+            ]
+
+    return hooks
+
+
+async def report_sync_middleware():
+    """
+    ASGI lifespan startup hook, logs the warnings of 'check_async_middleware' and the
+    middleware hooks that still run in a thread.
+    """
+    for warning in check_async_middleware():
+        logger.warning("%s", warning)
+
+    hooks: list = get_thread_hooks()
+    if hooks:
+        logger.warning(
+            "%s middleware hooks run in a thread per request: %s", len(hooks), ", ".join(hooks)
+        )
+
+
+async def check_vote_indexes():
+    """
+    ASGI lifespan startup hook, fails the startup if the vote engine ('POLL_VOTE_ENGINE')
+    relies on the unique index of 'user_actions' and it is missing (see
+    'AtomicVoteRepository.check_unique_index').
+    """
+    if getattr(settings, "POLL_VOTE_ENGINE", "transaction") in ("atomic", "buffered"):
+        await AtomicVoteRepository().check_unique_index()
@@ -0,0 +1,53 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class LifespanApplication:
+    """
+    Wraps the Django ASGI application to handle the ASGI lifespan protocol, which Django
+    doesn't support.
+
+    'on_startup' and 'on_shutdown' are coroutine functions called in the event loop of
+    the worker when the server starts and stops (the server must run with lifespan
+    enabled, e.g. 'uvicorn --lifespan on'). A failing shutdown hook is logged and the
+    others still run.
+
+    Args:
+        application: The ASGI application of the HTTP and WebSocket connections.
+        on_startup (list): The startup hooks.
+        on_shutdown (list): The shutdown hooks, called in order.
+    """
+
+    def __init__(self, application, on_startup: list = None, on_shutdown: list = None):
+        self.application = application
+        self.on_startup = on_startup or []
+        self.on_shutdown = on_shutdown or []
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "lifespan":
+            return await self.application(scope, receive, send)
+
+        while True:
+            message = await receive()
+
+            if message["type"] == "lifespan.startup":
+                try:
+                    for hook in self.on_startup:
+                        await hook()
+                except Exception as error:
+                    logger.exception("Lifespan startup hook failed.")
+                    await send({"type": "lifespan.startup.failed", "message": str(error)})
+                    return
+
+                await send({"type": "lifespan.startup.complete"})
+
+            elif message["type"] == "lifespan.shutdown":
+                for hook in self.on_shutdown:
+                    try:
+                        await hook()
+                    except Exception:
+                        logger.exception("Lifespan shutdown hook %s failed.", hook.__qualname__)
+
+                await send({"type": "lifespan.shutdown.complete"})
+                return
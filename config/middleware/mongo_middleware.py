@@ -1,12 +1,85 @@
-# MongoDB connection using Singleton.
-from utils.mongo_connection import MongoDBSingleton
+import json
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from utils.mongo_metrics import CommandStats, request_command_stats
+
+logger = logging.getLogger("mongo.requests")
+
 
 # MongoDB Middleware.
 class MongoDBMiddleware:
-    def __init__(self, get_res):
-        self.get_res = get_res
-        self.mongo_conn = MongoDBSingleton()
+    """
+    Counts and times the MongoDB commands run while handling each request.
+
+    The commands are reported by 'utils.mongo_metrics.CommandMetrics', registered on the
+    MongoDB clients. The totals are added to the response as a 'Server-Timing' header
+    ('mongo;desc="<count> ops";dur=<ms>') and logged as one JSON line on the
+    'mongo.requests' logger, with the number of each command (a request whose 'find'
+    count grows with the page size is an N+1).
+
+    Runs in the mode of the next handler (sync under WSGI, async under ASGI), so async
+    views are not adapted.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
-        res = self.get_res(request)
-        return res
\ No newline at end of file
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        stats = CommandStats()
+        token = request_command_stats.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_command_stats.reset(token)
+
+        return self.process_stats(request=request, response=response, stats=stats)
+
+    async def __acall__(self, request):
+        stats = CommandStats()
+        token = request_command_stats.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_command_stats.reset(token)
+
+        return self.process_stats(request=request, response=response, stats=stats)
+
+    def process_stats(self, request, response, stats: CommandStats):
+        duration_ms: float = stats.duration * 1000
+
+        if stats.count:
+            response.headers["Server-Timing"] = ", ".join(
+                filter(
+                    None,
+                    [
+                        response.headers.get("Server-Timing"),
+                        f'mongo;desc="{stats.count} ops";dur={duration_ms:.2f}',
+                    ],
+                )
+            )
+
+        logger.info(
+            json.dumps(
+                {
+                    "method": request.method,
+                    "path": request.path,
+                    "status": response.status_code,
+                    "mongo_ops": stats.count,
+                    "mongo_failures": stats.failures,
+                    "mongo_ms": round(duration_ms, 2),
+                    "mongo_commands": dict(stats.commands),
+                }
+            )
+        )
+
+        return response
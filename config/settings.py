@@ -100,6 +100,25 @@ DATABASE_ROUTERS = [
 ]
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Poll details, see 'apps.polls.utils.poll_cache'.
+    'polls': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'polls',
+    },
+}
+
+POLL_CACHE_ALIAS = 'polls'
+# Seconds a poll detail stays cached, writes invalidate it earlier.
+POLL_CACHE_TIMEOUT = 60
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -178,3 +197,74 @@ REST_FRAMEWORK = {
         'rest_framework.authentication.TokenAuthentication',
     ]
 }
+
+# MongoDB client (see 'utils.mongo_connection'), the URI comes from the MONGO_URI
+# environment variable. One client, with its own pool, per event loop (ASGI worker).
+MONGO_MAX_POOL_SIZE = 100
+MONGO_MIN_POOL_SIZE = 0
+# Milliseconds an operation waits for a free pool connection before failing
+# (None waits until the operation times out).
+MONGO_WAIT_QUEUE_TIMEOUT_MS = None
+MONGO_SERVER_SELECTION_TIMEOUT_MS = 30000
+# Wire compression, in order of preference: "zstd" (requires 'zstandard'), "snappy"
+# (requires 'python-snappy'), "zlib". Empty disables it.
+MONGO_COMPRESSORS = []
+# "primary", "primaryPreferred", "secondary", "secondaryPreferred" or "nearest". The
+# transactions of the vote engine, comments and polls read from the primary only.
+MONGO_READ_PREFERENCE = 'primary'
+
+# One JSON line per request with its MongoDB commands, see
+# 'config.middleware.mongo_middleware'.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'mongo.requests': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        # Module loggers of the project (lifespan hooks, vote buffer, MongoDB client).
+        'apps': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+        'config': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+        'utils': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+    },
+}
+
+# Polls settings.
+# Poll feeds that join the authenticated user's actions with a '$lookup' in the feed
+# aggregation instead of a separate batched query. Feed names: "keyword", "user",
+# "user_votes", "user_shares", "user_bookmarks" and "category".
+POLL_FEEDS_USER_ACTIONS_LOOKUP = []
+# Decode the documents of the poll and comment lists as 'RawBSONDocument', nested
+# documents are only decoded when they are converted to JSON.
+POLL_LIST_RAW_BSON = False
+
+# Accounts settings.
+# In-process cache of the owner data (username, profile picture, name) shown on polls
+# and comments. TTL in seconds. An edit only invalidates the cache of the worker that
+# handled it, the other workers serve the old owner data for up to the TTL: keep it
+# short, a hot owner is still read at most once per TTL and worker.
+OWNER_CACHE_MAXSIZE = 2048
+OWNER_CACHE_TTL = 5
+
+# Vote engine: "transaction" (multi-document transactions), "atomic" (conditional
+# single-document writes, requires the unique (user_id, poll_id) index on user_actions)
+# or "buffered" (like "atomic", with the poll counters flushed in batches).
+POLL_VOTE_ENGINE = 'transaction'
+# Seconds between two flushes of the buffered vote counters.
+POLL_VOTE_BUFFER_INTERVAL = 1.0
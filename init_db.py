@@ -19,7 +19,7 @@ def create_index_text():
     # Retrieve the list of indexes before creating the new index.
     before_indexes = db.polls.index_information()
     # Check if exist.
-    text_index_exists = before_indexes['title_text_description_text_category_text']
+    text_index_exists = 'title_text_description_text_category_text' in before_indexes
 
     if not text_index_exists:
         # Create index.
@@ -33,4 +33,5 @@ def create_index_text():
         print('The text index already exists. No action was taken.')
 
 
+# The other indexes are built with 'python manage.py ensure_indexes'.
 create_index_text()
@@ -0,0 +1,25 @@
+import asyncio
+
+
+async def run_concurrently(*aws) -> list:
+    """
+    Runs independent awaitables concurrently and returns their results in order.
+
+    The awaitables run as tasks of an 'asyncio.TaskGroup': if one fails, the others are
+    cancelled and awaited before the error is raised. The error is raised as is, not
+    wrapped in an 'ExceptionGroup', so callers keep catching 'NotFound',
+    'ValidationError', etc. When several fail, the error of the first awaitable (in
+    argument order) is raised.
+    """
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks: list = [group.create_task(aw) for aw in aws]
+
+    except BaseExceptionGroup as errors:
+        for task in tasks:
+            if not task.cancelled() and task.exception() is not None:
+                raise task.exception()
+
+        raise errors.exceptions[0]
+
+    return [task.result() for task in tasks]
@@ -0,0 +1,30 @@
+import hashlib
+
+from django.utils.http import parse_etags
+
+
+class ETag:
+    """
+    Helpers for weak ETags built from document versions.
+    """
+
+    def make_weak(self, *parts) -> str:
+        """
+        Builds a weak ETag from the values that identify a representation.
+        """
+        digest: str = hashlib.md5(":".join(str(part) for part in parts).encode()).hexdigest()
+        return f'W/"{digest}"'
+
+    def matches(self, request, etag: str) -> bool:
+        """
+        Checks the 'If-None-Match' header of a request against an ETag (weak comparison).
+        """
+        header: str = request.META.get("HTTP_IF_NONE_MATCH", "")
+        if not header:
+            return False
+
+        tags: list = parse_etags(header)
+        if "*" in tags:
+            return True
+
+        return etag.removeprefix("W/") in {tag.removeprefix("W/") for tag in tags}
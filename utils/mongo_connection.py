@@ -1,12 +1,76 @@
+import asyncio
+import logging
 import os
+import threading
+
 from dotenv import load_dotenv
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo import errors
 
+from django.conf import settings
+
+from utils.mongo_metrics import command_metrics, pool_metrics
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+
+class LazyDatabase:
+    """
+    A database of the client of the running event loop.
+
+    Repositories keep it as a class attribute ('polls_db'), attributes and items
+    ('polls_db.polls', 'polls_db["polls"]') are resolved when used.
+    """
+
+    def __init__(self, connection: "MongoDBSingleton", name: str):
+        self.connection = connection
+        self.name = name
+
+    def get(self):
+        return self.connection.get_client()[self.name]
+
+    def __getattr__(self, name: str):
+        return getattr(self.get(), name)
+
+    def __getitem__(self, name: str):
+        return self.get()[name]
+
+
+class LazyClient:
+    """
+    The client of the running event loop, see 'MongoDBSingleton.get_client'.
+    """
+
+    def __init__(self, connection: "MongoDBSingleton"):
+        self.connection = connection
+
+    def __getattr__(self, name: str):
+        return getattr(self.connection.get_client(), name)
+
+    def __getitem__(self, name: str) -> LazyDatabase:
+        return LazyDatabase(connection=self.connection, name=name)
+
+    def close(self):
+        self.connection.close_client()
+
 
 class MongoDBSingleton:
+    """
+    The MongoDB connection of the process.
+
+    A Motor client is bound to the event loop it is first used in, so one client is
+    created lazily per event loop (under ASGI, one per worker). 'client' can be used
+    at import time, it resolves the client of the running loop when used.
+
+    The client options come from the settings ('MONGO_MAX_POOL_SIZE',
+    'MONGO_MIN_POOL_SIZE', 'MONGO_WAIT_QUEUE_TIMEOUT_MS',
+    'MONGO_SERVER_SELECTION_TIMEOUT_MS', 'MONGO_COMPRESSORS', 'MONGO_READ_PREFERENCE'),
+    the pool checkouts and the commands are recorded by the listeners of
+    'utils.mongo_metrics'.
+    """
+
     _instance = None
 
     def __new__(cls, *args, **kwargs):
@@ -16,23 +80,93 @@ class MongoDBSingleton:
         return cls._instance
 
     def _initialize_connection(self):
+        self.clients: dict = {}
+        self.lock = threading.Lock()
+        self.client = LazyClient(connection=self)
+
+    def get_client_options(self) -> dict:
+        options: dict = {
+            "maxPoolSize": getattr(settings, "MONGO_MAX_POOL_SIZE", 100),
+            "minPoolSize": getattr(settings, "MONGO_MIN_POOL_SIZE", 0),
+            "waitQueueTimeoutMS": getattr(settings, "MONGO_WAIT_QUEUE_TIMEOUT_MS", None),
+            "serverSelectionTimeoutMS": getattr(
+                settings, "MONGO_SERVER_SELECTION_TIMEOUT_MS", 30000
+            ),
+            "readPreference": getattr(settings, "MONGO_READ_PREFERENCE", "primary"),
+            "event_listeners": [pool_metrics, command_metrics],
+        }
+
+        compressors: list = getattr(settings, "MONGO_COMPRESSORS", [])
+        if compressors:
+            options["compressors"] = ",".join(compressors)
+
+        return options
+
+    def get_client(self) -> AsyncIOMotorClient:
+        """
+        Returns the client of the running event loop, creating it if needed.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        client: AsyncIOMotorClient | None = self.clients.get(loop)
+        if client is not None:
+            return client
+
+        with self.lock:
+            # The clients of closed loops can't be used anymore.
+            for closed in [other for other in self.clients if other and other.is_closed()]:
+                self.clients.pop(closed).close()
+
+            if loop not in self.clients:
+                self.clients[loop] = self._create_client()
+
+            return self.clients[loop]
+
+    def _create_client(self) -> AsyncIOMotorClient:
+        """
+        Creates a client, errors are logged and raised (a failed client is not stored).
+        """
         MONGO_URI = os.getenv("MONGO_URI")
 
         try:
-            self.client = AsyncIOMotorClient(MONGO_URI)
+            client = AsyncIOMotorClient(MONGO_URI, **self.get_client_options())
+
+        except errors.InvalidURI:
+            logger.exception("MongoDB Invalid URI error.")
+            raise
 
-            print('"MongoDB connection successful..."')
+        except errors.ConfigurationError:
+            logger.exception("MongoDB configuration error.")
+            raise
 
-        except errors.ServerSelectionTimeoutError as e:
-            print(
-                f"{self._get_current_timestamp()} MongoDB server selection timeout error: {e}"
-            )
+        except errors.PyMongoError:
+            logger.exception("MongoDB connection error.")
+            raise
+
+        logger.info("MongoDB client created.")
+
+        return client
+
+    def close_client(self):
+        """
+        Closes the client of the running event loop, the next use creates a new one.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
 
-        except errors.ConnectionFailure as e:
-            print(f"{self._get_current_timestamp()} MongoDB connection error: {e}")
+        with self.lock:
+            client: AsyncIOMotorClient | None = self.clients.pop(loop, None)
 
-        except errors.InvalidURI as e:
-            print(f"{self._get_current_timestamp()} MongoDB Invalid URI error: {e}")
+        if client is not None:
+            client.close()
 
-        except errors.ConfigurationError as e:
-            print(f"{self._get_current_timestamp()} MongoDB configuration error: {e}")
+    async def close(self):
+        """
+        Closes the client of the running event loop (ASGI lifespan shutdown).
+        """
+        self.close_client()
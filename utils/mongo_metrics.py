@@ -0,0 +1,171 @@
+import os
+import threading
+from collections import defaultdict
+from contextvars import ContextVar
+
+from pymongo import monitoring
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """
+    Connection pool metrics of the MongoDB clients of the process.
+
+    Records how long operations wait to check out a connection from the pool (the pool
+    is saturated when the wait grows, 'maxPoolSize' is reached), the failed checkouts
+    ('timeout' when 'waitQueueTimeoutMS' expires) and the open and checked out
+    connections. pymongo calls the listener from the driver threads, counters are
+    updated under a lock.
+
+    The metrics are per process, each worker has its own.
+    """
+
+    # Upper bounds of the checkout wait histogram, in seconds.
+    BUCKETS: tuple = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.checkouts: int = 0
+            self.failures: dict = defaultdict(int)
+            self.wait_total: float = 0.0
+            self.wait_max: float = 0.0
+            self.wait_buckets: list = [0] * (len(self.BUCKETS) + 1)
+            self.open: int = 0
+            self.checked_out: int = 0
+
+    def observe_wait(self, duration: float | None):
+        if duration is None:
+            return
+
+        self.wait_total += duration
+        self.wait_max = max(self.wait_max, duration)
+
+        for index, bound in enumerate(self.BUCKETS):
+            if duration <= bound:
+                self.wait_buckets[index] += 1
+                return
+
+        self.wait_buckets[-1] += 1
+
+    def snapshot(self) -> dict:
+        """
+        Returns the current metrics, waits in milliseconds.
+        """
+        with self.lock:
+            buckets: dict = {
+                f"le_{int(bound * 1000)}ms": count
+                for bound, count in zip(self.BUCKETS, self.wait_buckets)
+            }
+            buckets["inf"] = self.wait_buckets[-1]
+            attempts: int = self.checkouts + sum(self.failures.values())
+
+            return {
+                "pid": os.getpid(),
+                "checkouts": self.checkouts,
+                "failures": dict(self.failures),
+                "wait_avg_ms": self.wait_total * 1000 / attempts if attempts else 0.0,
+                "wait_max_ms": self.wait_max * 1000,
+                "wait_buckets": buckets,
+                "connections_open": self.open,
+                "connections_checked_out": self.checked_out,
+            }
+
+    def connection_checked_out(self, event: monitoring.ConnectionCheckedOutEvent):
+        with self.lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.observe_wait(event.duration)
+
+    def connection_check_out_failed(self, event: monitoring.ConnectionCheckOutFailedEvent):
+        with self.lock:
+            self.failures[event.reason] += 1
+            self.observe_wait(event.duration)
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent):
+        with self.lock:
+            self.checked_out -= 1
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent):
+        with self.lock:
+            self.open += 1
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent):
+        with self.lock:
+            self.open -= 1
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+
+class CommandStats:
+    """
+    The MongoDB commands run while handling one request: their number and total
+    duration, by command name.
+
+    Motor runs the commands in its executor threads with a copy of the context of the
+    caller, so the commands of tasks started by the request are counted too.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.count: int = 0
+        self.failures: int = 0
+        self.duration: float = 0.0
+        self.commands: dict = defaultdict(int)
+
+    def add(self, command_name: str, duration_micros: int, failed: bool = False):
+        with self.lock:
+            self.count += 1
+            self.failures += failed
+            self.duration += duration_micros / 1_000_000
+            self.commands[command_name] += 1
+
+
+# The stats of the request being handled, set by 'MongoDBMiddleware'.
+request_command_stats: ContextVar = ContextVar("request_command_stats", default=None)
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """
+    Adds every command that completes to the stats of the current request, if any.
+    """
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        stats: CommandStats | None = request_command_stats.get()
+        if stats is not None:
+            stats.add(command_name=event.command_name, duration_micros=event.duration_micros)
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        stats: CommandStats | None = request_command_stats.get()
+        if stats is not None:
+            stats.add(
+                command_name=event.command_name,
+                duration_micros=event.duration_micros,
+                failed=True,
+            )
+
+
+# Registered on every client created by 'MongoDBSingleton'.
+pool_metrics = PoolMetrics()
+command_metrics = CommandMetrics()
@@ -1,6 +1,14 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from math import ceil
+
+from bson import json_util
+from bson.errors import BSONError
 from django.core.paginator import Paginator
 from asgiref.sync import sync_to_async
 
+from rest_framework.exceptions import ValidationError
+
 
 class Pagination:
     def paginate(self, object_list: list, page: int, page_size: int):
@@ -45,3 +53,144 @@ class Pagination:
         return await sync_to_async(self.paginate)(
             object_list=object_list, page=page, page_size=page_size
         )
+
+    def get_skip_limit(self, page: int, page_size: int):
+        """
+        Translates a page number into the skip/limit pair used by the database.
+
+        A falsy page means "no pagination", which is returned as (0, 0).
+        """
+        if not page:
+            return 0, 0
+
+        skip: int = (max(page, 1) - 1) * page_size
+        limit: int = page_size
+
+        return skip, limit
+
+    def paginate_page(self, items: list, total_items: int, page: int, page_size: int):
+        """
+        Builds the pagination response for a page that was already sliced by the database.
+
+        Returns the same structure as 'paginate'.
+        """
+        message: str = ""
+        data: dict = {}
+
+        total_pages: int = max(ceil(total_items / page_size), 1) if page else 1
+        has_next: bool = False
+        has_previous: bool = False
+
+        if total_items == 0:
+            message = "No result found"
+        else:
+            if page:
+                has_previous = page > 1
+                has_next = page < total_pages
+
+            if not has_next:
+                message = "No more results"
+
+        data = {
+            "items": items,
+            "message": message,
+            "paginator": {
+                "page": page,
+                "total_items": total_items,
+                "total_pages": total_pages,
+                "has_previous": has_previous,
+                "has_next": has_next,
+            },
+        }
+
+        return data
+
+    def encode_cursor(self, values: list):
+        """
+        Encodes the sort key values of the last item of a page into an opaque cursor.
+        """
+        cursor: str = urlsafe_b64encode(json_util.dumps(values).encode()).decode()
+        return cursor
+
+    def decode_cursor(
+        self,
+        cursor: str,
+        size: int | None = None,
+        types: list | None = None,
+        raise_exception: bool = True,
+    ):
+        """
+        Decodes a cursor created by 'encode_cursor'.
+
+        An empty cursor means "first page" and is returned as None. If 'size' is given,
+        the cursor must hold exactly that number of values. If 'types' is given (one
+        tuple of types per sort key), the cursor must hold one value of the expected
+        type per key: the values go into the query, anything else (e.g. an operator
+        document such as {"$regex": ...}) is rejected.
+        """
+        if not cursor:
+            return None
+
+        try:
+            values: list = json_util.loads(urlsafe_b64decode(cursor.encode()).decode())
+
+        # Extended JSON with wrong value types ({"$oid": 5}) or out of range dates.
+        except (BinasciiError, UnicodeDecodeError, ValueError, TypeError, KeyError, BSONError):
+            values = None
+
+        if types is not None:
+            size = len(types)
+
+        is_valid: bool = isinstance(values, list) and (not size or len(values) == size)
+
+        if is_valid and types is not None:
+            is_valid = all(
+                isinstance(value, key_types) and not isinstance(value, bool)
+                for value, key_types in zip(values, types)
+            )
+
+        if not is_valid:
+            if raise_exception:
+                message: str = "Invalid cursor"
+                raise ValidationError(detail={"message": message})
+
+            return None
+
+        return values
+
+    def paginate_cursor(self, items: list, page_size: int, keys: list[str], cursor: str = ""):
+        """
+        Builds the response for keyset (cursor) pagination.
+
+        'items' must be fetched with a limit of 'page_size + 1', the extra item only
+        tells whether there is a next page. 'keys' are the sort fields the next cursor
+        is built from, in sort order.
+        """
+        message: str = ""
+        data: dict = {}
+
+        has_next: bool = len(items) > page_size
+        items = items[:page_size]
+        next_cursor: str | None = None
+
+        if has_next:
+            next_cursor = self.encode_cursor(values=[items[-1].get(key) for key in keys])
+
+        if not items:
+            message = "No result found" if not cursor else "No more results"
+        elif not has_next:
+            message = "No more results"
+
+        data = {
+            "items": items,
+            "message": message,
+            "paginator": {
+                "cursor": cursor,
+                "next_cursor": next_cursor,
+                "page_size": page_size,
+                "has_previous": bool(cursor),
+                "has_next": has_next,
+            },
+        }
+
+        return data
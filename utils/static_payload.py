@@ -0,0 +1,75 @@
+import gzip
+import hashlib
+import json
+
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class StaticPayload:
+    """
+    A JSON response body that never changes, rendered and compressed once.
+
+    The body is serialized at creation together with its gzip (and brotli, if the
+    'brotli' package is installed) variants and a strong ETag per variant. Requests are
+    answered with the variant accepted by the client, or with a 304 response when the
+    'If-None-Match' header matches.
+
+    Args:
+        data: The JSON serializable data.
+        max_age (int): The 'Cache-Control' max-age in seconds.
+    """
+
+    def __init__(self, data, max_age: int = 0):
+        body: bytes = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+        digest: str = hashlib.sha256(body).hexdigest()[:32]
+
+        # Encoding: (body, ETag). Each encoding is a different representation.
+        self.variants: dict = {
+            "identity": (body, f'"{digest}"'),
+            "gzip": (gzip.compress(body, compresslevel=9, mtime=0), f'"{digest}-gzip"'),
+        }
+        if brotli is not None:
+            self.variants["br"] = (brotli.compress(body), f'"{digest}-br"')
+
+        self.etags: set = {etag for _, etag in self.variants.values()}
+        self.cache_control: str = f"max-age={max_age}"
+
+    def get_encoding(self, accept_encoding: str):
+        """
+        Returns the preferred encoding of the 'Accept-Encoding' header that has a variant.
+        """
+        accepted: set = set()
+        for item in accept_encoding.split(","):
+            coding, _, params = item.strip().partition(";")
+            if params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+                accepted.add(coding.strip().lower())
+
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and encoding in accepted:
+                return encoding
+
+        return "identity"
+
+    def response(self, request) -> HttpResponse:
+        encoding: str = self.get_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        body, etag = self.variants[encoding]
+
+        if_none_match: list = parse_etags(request.META.get("HTTP_IF_NONE_MATCH", ""))
+        if "*" in if_none_match or self.etags.intersection(if_none_match):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(body, content_type="application/json")
+            if encoding != "identity":
+                response["Content-Encoding"] = encoding
+
+        response["ETag"] = etag
+        response["Cache-Control"] = self.cache_control
+        response["Vary"] = "Accept-Encoding"
+
+        return response